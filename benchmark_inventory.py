@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Inventory Benchmark Suite
+This program times the inventory_manager.py operations on synthetic
+inventories of increasing size and records peak memory use. Results are
+written as JSON so runs from different versions can be compared.
+
+Example:
+    python benchmark_inventory.py --sizes 1000 100000 --backends dict columnar
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from inventory_index import IndexedInventory
+from inventory_manager import (
+    add_item,
+    calculate_total_value,
+    display_inventory,
+    remove_item,
+    update_item,
+)
+from inventory_store import ColumnarInventory, CompactInventory, IncrementalInventory
+
+# Storage backends that can be compared on the same workload
+BACKENDS = {
+    "dict": dict,
+    "columnar": ColumnarInventory,
+    "incremental": IncrementalInventory,
+    "indexed": IndexedInventory,
+    "compact": CompactInventory,
+}
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_records(size, seed):
+    """
+    Generate a reproducible synthetic inventory.
+
+    Args:
+        size (int): Number of items
+        seed (int): Random seed
+
+    Returns:
+        list: (item_name, quantity, price) records
+    """
+    rng = random.Random(seed)
+    return [(f"sku{i:08d}", rng.randrange(1000), round(rng.uniform(0.1, 100.0), 2)) for i in range(size)]
+
+
+def time_call(function, *args, **kwargs):
+    """Return how many seconds one call takes."""
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def measure_peak_memory(factory, records):
+    """
+    Build an inventory under tracemalloc.
+
+    Returns:
+        int: Peak bytes allocated while building it
+    """
+    gc.collect()
+    tracemalloc.start()
+    inventory = factory()
+    for item_name, quantity, price in records:
+        inventory[item_name] = (quantity, price)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del inventory
+    return peak
+
+
+def benchmark_backend(factory, size, seed=42, sample=10_000, full_display_max=1_000_000):
+    """
+    Time every inventory operation for one backend and size.
+
+    add_item is timed for every item. update_item and remove_item are timed
+    on a random sample of items, and display_inventory both for one page and
+    (up to full_display_max items) for the whole inventory. Output from the
+    operations is discarded.
+
+    Returns:
+        dict: Seconds per operation type, per-item costs and peak memory
+    """
+    records = make_records(size, seed)
+    rng = random.Random(seed + 1)
+    sample_names = [record[0] for record in rng.sample(records, min(sample, size))]
+    results = {"size": size}
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        inventory = factory()
+        start = time.perf_counter()
+        for item_name, quantity, price in records:
+            add_item(inventory, item_name, quantity, price)
+        results["add_item_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for item_name in sample_names:
+            update_item(inventory, item_name, quantity=7)
+        results["update_item_seconds"] = time.perf_counter() - start
+
+        results["calculate_total_value_seconds"] = time_call(calculate_total_value, inventory)
+        results["display_page_seconds"] = time_call(display_inventory, inventory, limit=50)
+        if size <= full_display_max:
+            results["display_full_seconds"] = time_call(display_inventory, inventory)
+
+        start = time.perf_counter()
+        for item_name in sample_names:
+            remove_item(inventory, item_name)
+        results["remove_item_seconds"] = time.perf_counter() - start
+
+    results["add_item_us_per_op"] = results["add_item_seconds"] / size * 1e6
+    results["update_item_us_per_op"] = results["update_item_seconds"] / len(sample_names) * 1e6
+    results["remove_item_us_per_op"] = results["remove_item_seconds"] / len(sample_names) * 1e6
+
+    del inventory
+    results["peak_memory_bytes"] = measure_peak_memory(factory, records)
+    results["bytes_per_item"] = results["peak_memory_bytes"] / size
+    return results
+
+
+def run_suite(sizes, backends, seed=42, sample=10_000, full_display_max=1_000_000, progress=None):
+    """
+    Run the benchmark for every backend and size.
+
+    Args:
+        sizes (list): Inventory sizes to test
+        backends (list): Names from BACKENDS
+        seed (int): Random seed for the synthetic data
+        sample (int): Items touched by the update and remove passes
+        full_display_max (int): Largest size for the full display pass
+        progress (file, optional): Stream for progress messages
+
+    Returns:
+        dict: Environment details and a list of result rows
+    """
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "seed": seed,
+        "results": [],
+    }
+    for size in sizes:
+        for backend in backends:
+            if progress is not None:
+                print(f"Benchmarking {backend} with {size:,} items...", file=progress, flush=True)
+            row = benchmark_backend(BACKENDS[backend], size, seed, sample, full_display_max)
+            row["backend"] = backend
+            report["results"].append(row)
+    return report
+
+
+def main():
+    """Parse command-line options, run the suite and write JSON results."""
+    parser = argparse.ArgumentParser(description="Benchmark inventory operations at scale")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Inventory sizes, e.g. 1000 10000 10000000")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=["dict"],
+                        help="Storage backends to compare on the same workload")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--sample", type=int, default=10_000,
+                        help="Items touched by the update and remove passes")
+    parser.add_argument("--full-display-max", type=int, default=1_000_000,
+                        help="Skip the full display pass above this size")
+    parser.add_argument("--output", help="Write JSON here instead of standard output")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.backends, args.seed, args.sample,
+                       args.full_display_max, progress=sys.stderr)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            output_file.write(text + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
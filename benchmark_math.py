@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Math Benchmark
+This program compares the original recursive implementations from
+recursive_artistry.py with the engines in fast_math.py.
+"""
+
+import argparse
+import random
+import sys
+import time
+
+from fast_math import (
+    FactorialCheckpoints, factorial, factorial_mod, fibonacci, fibonacci_last_digits, fibonacci_mod,
+)
+from memoize import LFU, LRU, memoize
+
+
+def recursive_fibonacci(n):
+    """The original double-recursive Fibonacci, kept for comparison."""
+    if n <= 0:
+        return 0
+    elif n == 1:
+        return 1
+    else:
+        return recursive_fibonacci(n - 1) + recursive_fibonacci(n - 2)
+
+
+def recursive_factorial(n):
+    """The original one-frame-per-n factorial, kept for comparison."""
+    if n <= 1:
+        return 1
+    else:
+        return n * recursive_factorial(n - 1)
+
+
+@memoize(maxsize=None)
+def memoized_fibonacci(n):
+    """The original double recursion, recursing through a cache."""
+    if n <= 0:
+        return 0
+    elif n == 1:
+        return 1
+    else:
+        return memoized_fibonacci(n - 1) + memoized_fibonacci(n - 2)
+
+
+def loop_factorial(n):
+    """The factorial loop from loops.py, kept for comparison."""
+    result = 1
+    for i in range(1, n + 1):
+        result = result * i
+    return result
+
+
+def time_call(function, *args):
+    """
+    Time one call.
+
+    Returns:
+        tuple: (result, seconds)
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark_fibonacci(recursive_sizes, fast_sizes):
+    """Print timings for the recursive and fast-doubling Fibonacci."""
+    print("\n--- Fibonacci ---")
+    print(f"{'n':>12} {'recursive':>12} {'fast doubling':>14}")
+    for n in recursive_sizes:
+        expected, recursive_seconds = time_call(recursive_fibonacci, n)
+        result, fast_seconds = time_call(fibonacci, n)
+        assert result == expected, f"Mismatch at n={n}"
+        print(f"{n:>12,} {recursive_seconds:>11.4f}s {fast_seconds:>13.6f}s")
+    for n in fast_sizes:
+        _, fast_seconds = time_call(fibonacci, n)
+        print(f"{n:>12,} {'-':>12} {fast_seconds:>13.6f}s")
+
+
+def benchmark_factorial(recursive_sizes, fast_sizes):
+    """Print timings for the recursive, looping and fast factorials."""
+    print("\n--- Factorial ---")
+    print(f"{'n':>12} {'recursive':>12} {'loop':>12} {'engine':>12} {'repeat':>12}")
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), max(recursive_sizes, default=0) + 100))
+    for n in recursive_sizes + fast_sizes:
+        if n in recursive_sizes:
+            _, recursive_text = time_call(recursive_factorial, n)
+            recursive_text = f"{recursive_text:.4f}s"
+        else:
+            recursive_text = "-"
+        expected, loop_seconds = time_call(loop_factorial, n)
+        result, fast_seconds = time_call(factorial, n)
+        assert result == expected, f"Mismatch at n={n}"
+        _, repeat_seconds = time_call(factorial, n)
+        print(f"{n:>12,} {recursive_text:>12} {loop_seconds:>11.4f}s {fast_seconds:>11.4f}s {repeat_seconds:>11.6f}s")
+
+    # Nearby queries reuse a checkpoint instead of starting over
+    checkpoints = FactorialCheckpoints()
+    base = fast_sizes[-1] if fast_sizes else 1000
+    checkpoints.factorial(base)
+    _, nearby_seconds = time_call(checkpoints.factorial, base + base // 20)
+    print(f"n = {base + base // 20:,} from a checkpoint at {base:,}: {nearby_seconds:.4f}s")
+
+
+def benchmark_modular():
+    """Print timings for the modular engines at sizes the exact ones cannot reach."""
+    print("\n--- Modular ---")
+    prime = 1_000_000_007
+    cases = [
+        (f"F(10**18) mod {prime}", fibonacci_mod, 10 ** 18, prime),
+        ("last 12 digits of F(10**18)", fibonacci_last_digits, 10 ** 18, 12),
+        (f"(10**7)! mod {prime}", factorial_mod, 10 ** 7, prime),
+        (f"({prime - 10 ** 7})! mod {prime}", factorial_mod, prime - 10 ** 7, prime),
+    ]
+    for label, function, n, modulus in cases:
+        result, seconds = time_call(function, n, modulus)
+        print(f"{label:>36} = {result:<14} {seconds:.4f}s")
+
+
+def benchmark_memoization(recursive_n, queries=400, distinct=40, cache_size=10):
+    """Print timings and cache statistics for memoized functions."""
+    print("\n--- Memoization ---")
+    _, plain_seconds = time_call(recursive_fibonacci, recursive_n)
+    memoized_fibonacci.cache_clear()
+    _, memo_seconds = time_call(memoized_fibonacci, recursive_n)
+    print(f"recursive fibonacci({recursive_n}): {plain_seconds:.4f}s plain, "
+          f"{memo_seconds:.6f}s memoized  {memoized_fibonacci.cache_info()}")
+
+    # A skewed stream of repeated queries: a few n are asked for most of the time
+    generator = random.Random(42)
+    sizes = [500 * (i + 1) for i in range(distinct)]
+    workload = generator.choices(sizes, weights=[1 / (i + 1) for i in range(distinct)], k=queries)
+
+    def uncached(n):
+        return factorial(n, use_checkpoints=False)
+
+    _, base_seconds = time_call(lambda: [uncached(n) for n in workload])
+    print(f"{queries} factorial queries over {distinct} values, uncached: {base_seconds:.4f}s")
+    for policy in (LRU, LFU):
+        cached = memoize(maxsize=cache_size, policy=policy)(uncached)
+        _, seconds = time_call(lambda: [cached(n) for n in workload])
+        info = cached.cache_info()
+        print(f"  {policy} cache of {cache_size}: {seconds:.4f}s  hit rate {cached.hit_rate():.0%}  "
+              f"evictions {info.evictions}  speedup {base_seconds / seconds:4.1f}x")
+
+
+def main():
+    """Parse command-line options and run the benchmarks."""
+    parser = argparse.ArgumentParser(description="Compare recursive and fast math engines")
+    parser.add_argument("--recursive-max", type=int, default=30,
+                        help="Largest n to run through the recursive versions")
+    args = parser.parse_args()
+
+    recursive_sizes = [n for n in (10, 20, 25, 30, 35) if n <= args.recursive_max]
+    benchmark_fibonacci(recursive_sizes, [1_000, 100_000, 1_000_000])
+    benchmark_factorial([100, 500, 900], [10_000, 50_000, 100_000])
+    benchmark_modular()
+    benchmark_memoization(max(recursive_sizes, default=20))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Big Integer Output
+This module inspects and saves the huge integers produced by fast_math.py.
+CPython's str(int) takes quadratic time and, since Python 3.11, refuses
+numbers over 4300 digits. The functions here count digits and read the
+leading and trailing digits without converting the whole number, convert
+in full with a divide-and-conquer method built on the decimal module, and
+dump numbers in hex or raw bytes, which are linear-time.
+"""
+
+import argparse
+import decimal
+import math
+import sys
+import time
+from functools import lru_cache
+
+# Numbers with at most this many digits are shown in full by describe()
+DISPLAY_DIGITS = 1000
+# Digits shown at each end of a number too long to show in full
+EDGE_DIGITS = 20
+# Characters written per call when saving a number to a file
+WRITE_CHUNK = 1 << 20
+# Pieces of at most this many bits are converted directly
+_DIRECT_BITS = 1024
+# Extra digits computed past the ones wanted, to detect rounding trouble
+_GUARD_DIGITS = 30
+
+_LOG10_2 = math.log10(2)
+_CONTEXT = decimal.Context(
+    prec=decimal.MAX_PREC,
+    Emax=decimal.MAX_EMAX,
+    Emin=decimal.MIN_EMIN,
+    traps=[decimal.Inexact, decimal.Overflow],
+)
+
+
+@lru_cache(maxsize=64)
+def _power_of_ten(exponent):
+    """Return 10**exponent, keeping recent powers for repeated queries."""
+    return 10 ** exponent
+
+
+def digit_count(n):
+    """
+    Count the decimal digits of an integer without converting it to text.
+
+    math.log10 works directly on big integers and is accurate to about
+    one part in 10**15. Only when the answer sits that close to a power of
+    ten is it checked exactly against 10**k.
+
+    Args:
+        n (int): Any integer; the sign is ignored
+
+    Returns:
+        int: Number of decimal digits, 1 for zero
+    """
+    n = abs(n)
+    if n < 10:
+        return 1
+    logarithm = math.log10(n)
+    digits = int(logarithm) + 1
+    margin = logarithm * 1e-14 + 1e-14
+    if logarithm - int(logarithm) < margin or int(logarithm) + 1 - logarithm < margin:
+        digits = int(logarithm + 0.5)
+        if n >= _power_of_ten(digits):
+            digits += 1
+    return digits
+
+
+def leading_digits(n, count=EDGE_DIGITS):
+    """
+    Return the first digits of an integer.
+
+    Only the top bits of the number are used: they are scaled by a power
+    of two in Decimal with a few guard digits. If the guard digits show the
+    result is too close to a rounding boundary, the exact (slower) integer
+    division is used instead.
+
+    Args:
+        n (int): Any integer; the sign is ignored
+        count (int): Number of digits wanted
+
+    Returns:
+        str: The leading digits, or every digit if there are fewer
+    """
+    n = abs(n)
+    digits = digit_count(n)
+    if digits <= count:
+        return str(n)
+
+    keep_bits = int((count + _GUARD_DIGITS) / _LOG10_2) + 1
+    shift = n.bit_length() - keep_bits
+    if shift > 0:
+        with decimal.localcontext() as context:
+            context.prec = count + _GUARD_DIGITS
+            context.Emax = decimal.MAX_EMAX
+            estimate = decimal.Decimal(n >> shift) * decimal.Decimal(2) ** shift
+        estimate_digits = "".join(map(str, estimate.as_tuple().digits))
+        guard = estimate_digits[count:count + _GUARD_DIGITS // 2]
+        if guard.strip("9") and guard.strip("0"):
+            return estimate_digits[:count]
+    return str(n // _power_of_ten(digits - count))
+
+
+def trailing_digits(n, count=EDGE_DIGITS):
+    """
+    Return the last digits of an integer, keeping leading zeros.
+
+    Args:
+        n (int): Any integer; the sign is ignored
+        count (int): Number of digits wanted
+
+    Returns:
+        str: The trailing digits, or every digit if there are fewer
+    """
+    n = abs(n)
+    if digit_count(n) <= count:
+        return str(n)
+    return str(n % _power_of_ten(count)).zfill(count)
+
+
+def to_decimal_string(n):
+    """
+    Convert an integer to decimal text in subquadratic time.
+
+    The number is split in half by bits over and over; the halves are
+    converted to Decimal and joined as hi * 2**k + lo with Decimal
+    arithmetic, whose multiplication is subquadratic. Decimal then
+    prints its own digits in linear time. Small numbers use str().
+
+    Args:
+        n (int): Any integer
+
+    Returns:
+        str: Decimal digits, with a leading "-" for negative numbers
+    """
+    if n.bit_length() <= _DIRECT_BITS:
+        return str(n)
+
+    powers = {}
+
+    def power_of_two(bits):
+        result = powers.get(bits)
+        if result is None:
+            if bits <= _DIRECT_BITS:
+                result = decimal.Decimal(1 << bits)
+            else:
+                half = bits >> 1
+                result = power_of_two(half) * power_of_two(bits - half)
+            powers[bits] = result
+        return result
+
+    def convert(value, bits):
+        if bits <= _DIRECT_BITS:
+            return decimal.Decimal(value)
+        half = bits >> 1
+        high = value >> half
+        low = value - (high << half)
+        return convert(high, bits - half) * power_of_two(half) + convert(low, half)
+
+    with decimal.localcontext(_CONTEXT):
+        magnitude = abs(n)
+        text = str(convert(magnitude, magnitude.bit_length()))
+    return "-" + text if n < 0 else text
+
+
+def describe(n, max_digits=DISPLAY_DIGITS, edge=EDGE_DIGITS):
+    """
+    Describe an integer for the console.
+
+    Args:
+        n (int): Any integer
+        max_digits (int): Longest number shown in full
+        edge (int): Digits shown at each end of a longer number
+
+    Returns:
+        str: The number itself, or "first...last (N digits)"
+    """
+    digits = digit_count(n)
+    if digits <= max_digits:
+        return to_decimal_string(n)
+    sign = "-" if n < 0 else ""
+    return f"{sign}{leading_digits(n, edge)}...{trailing_digits(n, edge)} ({digits:,} digits)"
+
+
+def _write_text(text, path, line_length=None):
+    """Write text to a file in chunks, optionally wrapped into lines."""
+    with open(path, "w", encoding="ascii") as output:
+        if line_length:
+            for start in range(0, len(text), line_length):
+                output.write(text[start:start + line_length])
+                output.write("\n")
+        else:
+            for start in range(0, len(text), WRITE_CHUNK):
+                output.write(text[start:start + WRITE_CHUNK])
+            output.write("\n")
+
+
+def write_decimal(n, path, line_length=None):
+    """
+    Save an integer to a text file in decimal.
+
+    The digits are converted in one piece and then written in chunks. The
+    finished string takes one byte per digit, which is less than the Decimal
+    arithmetic behind to_decimal_string() uses while it runs. Splitting the
+    Decimal by powers of ten to stream it costs more memory than it saves.
+
+    Args:
+        n (int): Any integer
+        path (str): Destination file
+        line_length (int, optional): Wrap the digits into lines of this length
+
+    Returns:
+        int: Number of digits written
+    """
+    text = to_decimal_string(n)
+    _write_text(text, path, line_length)
+    return len(text) - (n < 0)
+
+
+def write_hex(n, path, line_length=None):
+    """
+    Save an integer to a text file in hexadecimal, which takes linear time.
+
+    Returns:
+        int: Number of hex digits written
+    """
+    text = format(n, "x")
+    _write_text(text, path, line_length)
+    return len(text) - (n < 0)
+
+
+def write_bytes(n, path, byteorder="big"):
+    """
+    Save the magnitude of an integer as raw unsigned bytes.
+
+    The number can be read back with int.from_bytes(data, byteorder).
+
+    Returns:
+        int: Number of bytes written
+    """
+    data = abs(n).to_bytes(max(1, (abs(n).bit_length() + 7) // 8), byteorder)
+    with open(path, "wb") as output:
+        output.write(data)
+    return len(data)
+
+
+def save_number(n, path):
+    """
+    Save an integer in a format chosen by the file extension.
+
+    .hex gives hexadecimal text, .bin gives raw big-endian bytes and
+    anything else gives decimal text.
+
+    Returns:
+        str: Short description of what was written
+    """
+    lowered = path.lower()
+    if lowered.endswith(".hex"):
+        return f"{write_hex(n, path):,} hex digits"
+    if lowered.endswith(".bin"):
+        return f"{write_bytes(n, path):,} bytes"
+    return f"{write_decimal(n, path):,} decimal digits"
+
+
+def main():
+    """Compare str() with the converters here on a large factorial."""
+    import fast_math
+
+    parser = argparse.ArgumentParser(description="Benchmark big integer output")
+    parser.add_argument("n", type=int, nargs="?", default=200_000, help="Factorial to convert")
+    parser.add_argument("--output", help="Save the digits to this file")
+    parser.add_argument("--compare-str", action="store_true",
+                        help="Also time str(), which is quadratic and can take minutes")
+    args = parser.parse_args()
+
+    value = fast_math.factorial(args.n)
+    timings = [
+        ("digit_count", digit_count),
+        ("leading_digits", leading_digits),
+        ("trailing_digits", trailing_digits),
+        ("to_decimal_string", to_decimal_string),
+        ("hex", lambda number: format(number, "x")),
+    ]
+    for label, function in timings:
+        start = time.perf_counter()
+        function(value)
+        print(f"{label:>18} {time.perf_counter() - start:9.4f}s")
+
+    if args.compare_str:
+        if hasattr(sys, "set_int_max_str_digits"):
+            sys.set_int_max_str_digits(0)
+        start = time.perf_counter()
+        str(value)
+        print(f"{'str':>18} {time.perf_counter() - start:9.4f}s")
+
+    print(f"{args.n}! = {describe(value)}")
+    if args.output:
+        print(f"Saved {save_number(value, args.output)} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
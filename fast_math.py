@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+"""
+Fast Math Engines
+This module computes the sequences used by recursive_artistry.py and
+functions_and_recursion.py without deep recursion, so results stay fast
+and exact for very large n.
+"""
+
+import math
+from bisect import bisect_right, insort
+from functools import lru_cache
+from itertools import islice
+
+from memoize import lru_memoize
+
+# Largest number of factorial checkpoints kept by default
+FACTORIAL_CHECKPOINTS = 16
+# Consecutive integers multiplied together before each reduction in factorial_mod
+MOD_BLOCK_SIZE = 32
+# Factors below this are found by trial division, larger ones by Pollard's rho
+TRIAL_DIVISION_LIMIT = 1000
+# Steps of Pollard's rho taken between gcd checks
+RHO_BLOCK_SIZE = 128
+
+
+def fibonacci(n):
+    """
+    Calculate the nth Fibonacci number using fast doubling.
+
+    Fast doubling uses the identities
+        F(2k)   = F(k) * (2*F(k+1) - F(k))
+        F(2k+1) = F(k)^2 + F(k+1)^2
+    and walks the bits of n from the top, so it needs O(log n) big-integer
+    multiplications and no recursion at all.
+
+    Args:
+        n (int): Position in the sequence; values <= 0 give 0
+
+    Returns:
+        int: The nth Fibonacci number
+    """
+    if n <= 0:
+        return 0
+    return fibonacci_pair(n)[0]
+
+
+def fibonacci_pair(n):
+    """
+    Calculate F(n) and F(n + 1) together with fast doubling.
+
+    Args:
+        n (int): A non-negative position in the sequence
+
+    Returns:
+        tuple: (F(n), F(n + 1))
+    """
+    if n <= 0:
+        return 0, 1
+
+    # (a, b) holds (F(k), F(k+1)), starting from k = 0
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)   # F(2k)
+        d = a * a + b * b     # F(2k+1)
+        if bit == "1":
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+@lru_memoize(maxsize=128)
+def cached_fibonacci(n):
+    """
+    Calculate the nth Fibonacci number, keeping the 128 most recent results.
+
+    Args:
+        n (int): Position in the sequence
+
+    Returns:
+        int: The nth Fibonacci number
+    """
+    return fibonacci(n)
+
+
+def fibonacci_mod(n, modulus):
+    """
+    Calculate F(n) mod modulus without ever building F(n).
+
+    This is the same fast doubling as fibonacci(), reducing after every
+    step, so it takes O(log n) small multiplications even for n = 10**18.
+
+    Args:
+        n (int): Position in the sequence; values <= 0 give 0
+        modulus (int): A positive modulus
+
+    Returns:
+        int: F(n) % modulus
+
+    Raises:
+        ValueError: If modulus is not positive
+    """
+    if modulus <= 0:
+        raise ValueError("modulus must be positive")
+    if n <= 0 or modulus == 1:
+        return 0
+
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a) % modulus
+        d = (a * a + b * b) % modulus
+        if bit == "1":
+            a, b = d, (c + d) % modulus
+        else:
+            a, b = c, d
+    return a
+
+
+def _pollard_rho(n):
+    """
+    Find a nontrivial factor of an odd composite n.
+
+    Uses Brent's variant of Pollard's rho, which takes about the fourth
+    root of n's smallest prime factor in steps, and multiplies the
+    differences together so that only one gcd is taken per block of steps.
+    """
+    for constant in range(1, n):
+        y, factor, product, steps = 2, 1, 1, 1
+        while factor == 1:
+            x = y
+            for _ in range(steps):
+                y = (y * y + constant) % n
+            done = 0
+            while done < steps and factor == 1:
+                saved = y
+                for _ in range(min(RHO_BLOCK_SIZE, steps - done)):
+                    y = (y * y + constant) % n
+                    product = product * abs(x - y) % n
+                factor = math.gcd(product, n)
+                done += RHO_BLOCK_SIZE
+            steps *= 2
+        if factor == n:
+            # The block overshot; step through it again one gcd at a time
+            factor = 1
+            while factor == 1:
+                saved = (saved * saved + constant) % n
+                factor = math.gcd(abs(x - saved), n)
+        if factor != n:
+            return factor
+    raise ValueError(f"No factor found for {n}")
+
+
+def _prime_factors(n):
+    """
+    Factor n by trial division up to TRIAL_DIVISION_LIMIT, then split what
+    is left with _is_prime and Pollard's rho.
+
+    Returns:
+        dict: Maps each prime factor to its exponent
+    """
+    factors = {}
+    divisor = 2
+    while divisor < TRIAL_DIVISION_LIMIT and divisor * divisor <= n:
+        while n % divisor == 0:
+            factors[divisor] = factors.get(divisor, 0) + 1
+            n //= divisor
+        divisor += 1 if divisor == 2 else 2
+
+    pending = [n] if n > 1 else []
+    while pending:
+        n = pending.pop()
+        if _is_prime(n):
+            factors[n] = factors.get(n, 0) + 1
+        else:
+            factor = _pollard_rho(n)
+            pending += [factor, n // factor]
+    return factors
+
+
+def _is_fibonacci_period(length, modulus):
+    """Check whether the Fibonacci sequence mod modulus repeats after length terms."""
+    return fibonacci_mod(length, modulus) == 0 and fibonacci_mod(length + 1, modulus) == 1 % modulus
+
+
+def _smallest_period(bound, modulus):
+    """Shrink a known period to the smallest one by dividing out prime factors."""
+    period = bound
+    for prime in _prime_factors(bound):
+        while period % prime == 0 and _is_fibonacci_period(period // prime, modulus):
+            period //= prime
+    return period
+
+
+@lru_cache(maxsize=128)
+def pisano_period(modulus):
+    """
+    Calculate the Pisano period: the length after which F(n) mod modulus repeats.
+
+    The modulus is factored, and for each prime power p**k the period is
+    found among the divisors of a known multiple of it:
+    p - 1 when p ends in 1 or 9, 2 * (p + 1) when p ends in 3 or 7, and
+    p**(k - 1) times the period of p. The results are combined with lcm.
+    Factoring uses Pollard's rho, so a prime modulus such as 2**61 - 1 is
+    quick; the slow case is a modulus (or p - 1, p + 1) with two large
+    prime factors, since rho needs about the fourth root of the smaller.
+
+    Args:
+        modulus (int): A positive modulus
+
+    Returns:
+        int: The period; F(n) % modulus == F(n % period) % modulus
+
+    Raises:
+        ValueError: If modulus is not positive
+    """
+    if modulus <= 0:
+        raise ValueError("modulus must be positive")
+    if modulus == 1:
+        return 1
+
+    period = 1
+    for prime, exponent in _prime_factors(modulus).items():
+        if prime == 2:
+            bound = 3
+        elif prime == 5:
+            bound = 20
+        elif prime % 5 in (1, 4):
+            bound = prime - 1
+        else:
+            bound = 2 * (prime + 1)
+        prime_period = _smallest_period(bound, prime)
+        if exponent > 1:
+            power = prime ** exponent
+            prime_period = _smallest_period(prime_period * prime ** (exponent - 1), power)
+        period = math.lcm(period, prime_period)
+    return period
+
+
+def fibonacci_last_digits(n, digits):
+    """
+    Calculate the last digits of F(n).
+
+    The position is first reduced by the Pisano period of 10**digits.
+
+    Args:
+        n (int): Position in the sequence
+        digits (int): Number of trailing decimal digits, at least 1
+
+    Returns:
+        int: F(n) % 10**digits
+    """
+    modulus = 10 ** digits
+    return fibonacci_mod(n % pisano_period(modulus) if n > 0 else n, modulus)
+
+
+def _is_prime(n):
+    """Deterministic Miller-Rabin test, exact for n below 3.3 * 10**24."""
+    if n < 2:
+        return False
+    small_primes = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for prime in small_primes:
+        if n % prime == 0:
+            return n == prime
+    odd, twos = n - 1, 0
+    while odd % 2 == 0:
+        odd //= 2
+        twos += 1
+    for base in small_primes:
+        x = pow(base, odd, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(twos - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _range_product_mod(low, high, modulus):
+    """
+    Multiply every integer in low < k <= high modulo modulus.
+
+    The range is multiplied in blocks of MOD_BLOCK_SIZE with math.prod and
+    reduced once per block, which keeps the Python-level loop short.
+    """
+    result = 1 % modulus
+    for start in range(low + 1, high + 1, MOD_BLOCK_SIZE):
+        result = result * math.prod(range(start, min(start + MOD_BLOCK_SIZE, high + 1))) % modulus
+        if result == 0:
+            break
+    return result
+
+
+def factorial_mod(n, modulus):
+    """
+    Calculate n! mod modulus without building n!.
+
+    When n >= modulus the result is 0, since modulus is one of the factors.
+    For a prime modulus p and n past p / 2, Wilson's theorem
+    (p - 1)! = -1 (mod p) turns the problem into the shorter product
+    (n + 1) * ... * (p - 1) and one modular inverse. Products are taken in
+    blocks, so n around 10**7 takes about a second.
+
+    Args:
+        n (int): An integer; values <= 1 give 1 % modulus
+        modulus (int): A positive modulus
+
+    Returns:
+        int: n! % modulus
+
+    Raises:
+        ValueError: If modulus is not positive
+    """
+    if modulus <= 0:
+        raise ValueError("modulus must be positive")
+    if n >= modulus:
+        return 0
+    if n <= 1:
+        return 1 % modulus
+
+    if n > modulus // 2 and _is_prime(modulus):
+        # n! * (n + 1) * ... * (p - 1) = (p - 1)! = -1 (mod p)
+        remainder = _range_product_mod(n, modulus - 1, modulus)
+        return -pow(remainder, -1, modulus) % modulus
+    return _range_product_mod(1, n, modulus)
+
+
+def range_product(low, high):
+    """
+    Multiply every integer in the range low < k <= high.
+
+    The range is split in half over and over so that numbers of similar size
+    are multiplied together, which is much faster for big integers than
+    multiplying a growing product by one small number at a time. The split
+    depth is only log2(high - low), so recursion is never a problem.
+
+    Args:
+        low (int): Exclusive lower bound
+        high (int): Inclusive upper bound
+
+    Returns:
+        int: (low + 1) * (low + 2) * ... * high, or 1 for an empty range
+    """
+    count = high - low
+    if count <= 0:
+        return 1
+    if count <= 16:
+        return math.prod(range(low + 1, high + 1))
+    middle = (low + high) // 2
+    return range_product(low, middle) * range_product(middle, high)
+
+
+class FactorialCheckpoints:
+    """
+    Bounded cache of computed factorials for repeated queries.
+
+    A query for n! reuses the largest cached m! with m <= n and multiplies in
+    only the remaining range (m, n]. Checkpoints below n/2 are ignored, since
+    starting from scratch is faster by then. The most recently used
+    checkpoints are kept, up to max_checkpoints of them.
+    """
+
+    def __init__(self, max_checkpoints=FACTORIAL_CHECKPOINTS):
+        self.max_checkpoints = max_checkpoints
+        self._keys = []
+        self._values = {}
+        self._last_used = {}
+        self._clock = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        """Forget every checkpoint."""
+        self._keys.clear()
+        self._values.clear()
+        self._last_used.clear()
+
+    def factorial(self, n):
+        """
+        Calculate n! using the nearest checkpoint below n.
+
+        Args:
+            n (int): A non-negative integer
+
+        Returns:
+            int: The factorial of n
+        """
+        self._clock += 1
+        position = bisect_right(self._keys, n)
+        start = self._keys[position - 1] if position else 0
+        if start and start * 2 >= n:
+            self._last_used[start] = self._clock
+            if start == n:
+                return self._values[n]
+            result = self._values[start] * range_product(start, n)
+        else:
+            result = math.factorial(n)
+
+        self._store(n, result)
+        return result
+
+    def _store(self, n, value):
+        """Add a checkpoint, evicting the least recently used if full."""
+        if self.max_checkpoints <= 0:
+            return
+        if len(self._keys) >= self.max_checkpoints:
+            oldest = min(self._keys, key=self._last_used.__getitem__)
+            self._keys.remove(oldest)
+            del self._values[oldest]
+            del self._last_used[oldest]
+        insort(self._keys, n)
+        self._values[n] = value
+        self._last_used[n] = self._clock
+
+
+_checkpoints = FactorialCheckpoints()
+
+
+def factorial(n, use_checkpoints=True):
+    """
+    Calculate n! exactly, without recursion limits.
+
+    From scratch this uses math.factorial, which multiplies with a
+    divide-and-conquer split in C. With checkpoints, repeated or nearby
+    queries only multiply in the part of the range not already cached.
+
+    Args:
+        n (int): An integer; values <= 1 give 1
+        use_checkpoints (bool): Reuse and update the shared checkpoint cache
+
+    Returns:
+        int: The factorial of n
+    """
+    if n <= 1:
+        return 1
+    if use_checkpoints:
+        return _checkpoints.factorial(n)
+    return math.factorial(n)
+
+
+class FibonacciSequence:
+    """
+    Resumable iterator over the Fibonacci numbers F(start), F(start + 1), ...
+
+    Starting anywhere costs one fast-doubling jump. After that, every term
+    is a single big-integer addition, so printing the first N terms takes
+    time linear in N instead of calling fibonacci() N times.
+    """
+
+    def __init__(self, start=0):
+        """
+        Args:
+            start (int): Position of the first term produced
+
+        Raises:
+            ValueError: If start is negative
+        """
+        self.seek(start)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = self._current
+        self._current, self._next = self._next, self._current + self._next
+        self.index += 1
+        return value
+
+    def __repr__(self):
+        return f"{type(self).__name__}(start={self.index})"
+
+    def seek(self, n):
+        """
+        Jump so that the next term produced is F(n).
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("start must be non-negative")
+        self.index = n
+        self._current, self._next = fibonacci_pair(n)
+
+    def state(self):
+        """
+        Capture the position so iteration can resume later.
+
+        Returns:
+            tuple: (index, F(index), F(index + 1))
+        """
+        return self.index, self._current, self._next
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Resume from state() without recomputing anything.
+
+        Args:
+            state (tuple): Value returned by state()
+
+        Returns:
+            FibonacciSequence: Iterator whose next term is F(index)
+        """
+        sequence = cls.__new__(cls)
+        sequence.index, sequence._current, sequence._next = state
+        return sequence
+
+    @classmethod
+    def window(cls, start, stop):
+        """
+        Iterate over F(start), ..., F(stop - 1), like islice with a fast jump.
+
+        Returns:
+            iterator: The terms in order
+        """
+        return islice(cls(start), max(stop - start, 0))
+
+
+class FactorialSequence:
+    """
+    Resumable iterator over the factorials start!, (start + 1)!, ...
+
+    The first term comes from factorial(); every later term is one
+    multiplication by a small integer.
+    """
+
+    def __init__(self, start=0):
+        """
+        Args:
+            start (int): n of the first factorial produced
+
+        Raises:
+            ValueError: If start is negative
+        """
+        self.seek(start)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = self._current
+        self.index += 1
+        self._current *= self.index
+        return value
+
+    def __repr__(self):
+        return f"{type(self).__name__}(start={self.index})"
+
+    def seek(self, n):
+        """
+        Jump so that the next term produced is n!.
+
+        Raises:
+            ValueError: If n is negative
+        """
+        if n < 0:
+            raise ValueError("start must be non-negative")
+        self.index = n
+        self._current = factorial(n)
+
+    def state(self):
+        """
+        Capture the position so iteration can resume later.
+
+        Returns:
+            tuple: (index, index!)
+        """
+        return self.index, self._current
+
+    @classmethod
+    def from_state(cls, state):
+        """
+        Resume from state() without recomputing anything.
+
+        Args:
+            state (tuple): Value returned by state()
+
+        Returns:
+            FactorialSequence: Iterator whose next term is index!
+        """
+        sequence = cls.__new__(cls)
+        sequence.index, sequence._current = state
+        return sequence
+
+    @classmethod
+    def window(cls, start, stop):
+        """
+        Iterate over start!, ..., (stop - 1)!, like islice with a fast jump.
+
+        Returns:
+            iterator: The terms in order
+        """
+        return islice(cls(start), max(stop - start, 0))
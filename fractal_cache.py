@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Fractal Geometry Cache
+This module keeps computed fractal geometry on disk so that drawing the
+same fractal again skips the computation. Each result is stored under the
+SHA-256 of the function and all of its arguments, as a small header
+followed by raw float64 coordinates, and is loaded back by memory-mapping
+the file without copying it. The least recently used files are deleted
+when the cache grows past its size budget.
+"""
+
+import hashlib
+import inspect
+import json
+import mmap
+import os
+import struct
+from array import array
+
+import fractal_geometry
+
+# magic, number of float64 values
+GEOMETRY_HEADER = struct.Struct("<8sQ")
+GEOMETRY_MAGIC = b"FRACGEO1"
+GEOMETRY_SUFFIX = ".geom"
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fractal_geometry")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+def geometry_key(function, *args, **kwargs):
+    """
+    Build the cache key for a call to a geometry function.
+
+    Default values are filled in before hashing, so leaving an argument out
+    and passing its default give the same key.
+
+    Args:
+        function (callable): Geometry function, e.g. fractal_geometry.tree_segments
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+
+    Returns:
+        str: Hex SHA-256 of the function name and arguments
+    """
+    bound = inspect.signature(function).bind(*args, **kwargs)
+    bound.apply_defaults()
+    description = json.dumps(
+        [GEOMETRY_MAGIC.decode("ascii"), function.__module__, function.__qualname__, bound.arguments],
+        sort_keys=True,
+    )
+    return hashlib.sha256(description.encode("utf-8")).hexdigest()
+
+
+def geometry_view(buffer):
+    """
+    View the coordinates in a cached geometry file without copying them.
+
+    Args:
+        buffer: bytes, mmap or memoryview holding a geometry file
+
+    Returns:
+        memoryview: Coordinates cast to "d"
+
+    Raises:
+        ValueError: If the buffer is not a valid geometry file
+    """
+    view = memoryview(buffer)
+    if len(view) < GEOMETRY_HEADER.size:
+        raise ValueError("Geometry file is truncated")
+    magic, count = GEOMETRY_HEADER.unpack_from(view)
+    if magic != GEOMETRY_MAGIC:
+        raise ValueError("Not a geometry file")
+    end = GEOMETRY_HEADER.size + 8 * count
+    if len(view) < end:
+        raise ValueError("Geometry file is truncated")
+    return view[GEOMETRY_HEADER.size:end].cast("d")
+
+
+class GeometryCache:
+    """
+    Content-addressed on-disk cache of fractal coordinate arrays.
+
+    Hits are returned as read-only memoryviews over a memory map of the
+    cached file. A hit refreshes the file's modification time, which is
+    what eviction uses to find the least recently used entries.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Open a cache directory, creating it if needed.
+
+        Args:
+            directory (str): Where cached geometry files live
+            max_bytes (int): Total size the cache is trimmed back to
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.directory!r}, max_bytes={self.max_bytes})"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + GEOMETRY_SUFFIX)
+
+    def load(self, key):
+        """
+        Load cached coordinates by key.
+
+        Returns:
+            memoryview: Coordinates cast to "d", or None if the key is not
+                cached or its file is damaged
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as geometry_file:
+                # The view keeps the map alive after the file is closed
+                mapped = mmap.mmap(geometry_file.fileno(), 0, access=mmap.ACCESS_READ)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        try:
+            return geometry_view(mapped)
+        except ValueError:
+            mapped.close()
+            return None
+
+    def store(self, key, coordinates):
+        """
+        Save coordinates under a key and trim the cache to its budget.
+
+        The file is written to a temporary name first and moved into place,
+        so readers never see half a file.
+
+        Args:
+            key (str): Key from geometry_key()
+            coordinates (array): Flat float64 coordinates
+        """
+        if not isinstance(coordinates, array) or coordinates.typecode != "d":
+            coordinates = array("d", coordinates)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as geometry_file:
+            geometry_file.write(GEOMETRY_HEADER.pack(GEOMETRY_MAGIC, len(coordinates)))
+            coordinates.tofile(geometry_file)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def get(self, function, *args, **kwargs):
+        """
+        Return the result of a geometry function, computing it only on a miss.
+
+        If the cache directory cannot be written, the computed result is
+        still returned.
+
+        Args:
+            function (callable): Geometry function returning an array("d")
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            memoryview or array: Flat float64 coordinates
+        """
+        key = geometry_key(function, *args, **kwargs)
+        cached = self.load(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        coordinates = function(*args, **kwargs)
+        try:
+            self.store(key, coordinates)
+        except OSError:
+            pass
+        return coordinates
+
+    def entries(self):
+        """
+        List the cached files from least to most recently used.
+
+        Returns:
+            list: (mtime, size, path) tuples
+        """
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(GEOMETRY_SUFFIX):
+                    try:
+                        status = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((status.st_mtime, status.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    def size(self):
+        """Return the total size of the cached files in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, max_bytes=None):
+        """
+        Delete least recently used files until the cache fits its budget.
+
+        Args:
+            max_bytes (int, optional): Budget to trim to; defaults to max_bytes
+
+        Returns:
+            int: Number of files deleted
+        """
+        budget = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= budget:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Delete every cached file."""
+        return self.evict(0)
+
+
+def cached_fractal_segments(cache, fractal, level, min_length=None, viewport=None):
+    """
+    Cached version of fractal_geometry.fractal_segments().
+
+    Returns:
+        memoryview or array: Flat x0, y0, x1, y1 coordinates
+    """
+    return cache.get(fractal_geometry.fractal_segments, fractal, level, min_length, viewport)
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Fractal Geometry Engine
+This module computes the fractal tree and Koch snowflake from
+recursive_artistry.py as plain coordinate arrays, one whole level at a
+time, without a turtle or a display. The geometry can be written to SVG or
+PNG files, or handed to a turtle for viewing.
+
+Coordinates use the turtle's system: the origin is the centre of the
+canvas, x grows to the right, y grows upward and a heading of 0 points
+east. Segments are stored in a flat array as x0, y0, x1, y1, x0, y0, ...
+and polylines as x0, y0, x1, y1, ...
+"""
+
+import argparse
+import math
+import struct
+import time
+import zlib
+from array import array
+
+CANVAS_WIDTH = 800
+CANVAS_HEIGHT = 600
+
+# Segments shorter than this many pixels are not subdivided any further
+MIN_PIXEL_LENGTH = 1.0
+# Largest distance of a Koch curve from the straight line it replaces,
+# relative to the length of that line
+KOCH_HEIGHT = math.sqrt(3) / 6
+
+
+def canvas_viewport(width=CANVAS_WIDTH, height=CANVAS_HEIGHT):
+    """
+    Return the visible (xmin, ymin, xmax, ymax) of a canvas centred on the origin.
+    """
+    return (-width / 2, -height / 2, width / 2, height / 2)
+
+
+def _box_outside(viewport, x0, y0, x1, y1, margin):
+    """Check whether the box around two points, grown by margin, misses the viewport."""
+    xmin, ymin, xmax, ymax = viewport
+    return (min(x0, x1) - margin > xmax or max(x0, x1) + margin < xmin
+            or min(y0, y1) - margin > ymax or max(y0, y1) + margin < ymin)
+
+
+def _circle_outside(viewport, x, y, radius):
+    """Check whether a circle misses the viewport entirely."""
+    xmin, ymin, xmax, ymax = viewport
+    dx = x - min(max(x, xmin), xmax)
+    dy = y - min(max(y, ymin), ymax)
+    return dx * dx + dy * dy > radius * radius
+
+
+def tree_segments(level, length=100, origin=(0, -250), heading=90,
+                  right_angle=20, left_angle=40, scale=0.75, min_length=None, viewport=None):
+    """
+    Compute every branch of the fractal tree.
+
+    Each level turns all current branch tips into two new branches at once:
+    one turned right by right_angle and one turned left by left_angle from
+    the parent's heading, both scale times as long as the parent.
+
+    With level of detail, growth stops once branches are shorter than
+    min_length pixels, and tips whose whole subtree lies outside the
+    viewport are dropped. The work then depends on what is visible rather
+    than on level.
+
+    Args:
+        level (int): Recursion level; level 1 is just the trunk
+        length (float): Length of the trunk
+        origin (tuple): (x, y) of the base of the trunk
+        heading (float): Direction of the trunk in degrees
+        right_angle (float): Right turn for the first child branch
+        left_angle (float): Left turn for the second child branch
+        scale (float): Length of a child branch relative to its parent
+        min_length (float, optional): Shortest branch worth drawing
+        viewport (tuple, optional): Visible (xmin, ymin, xmax, ymax)
+
+    Returns:
+        array: Flat x0, y0, x1, y1 coordinates of at most 2**level - 1 segments
+    """
+    segments = array("d")
+    xs = array("d", [origin[0]])
+    ys = array("d", [origin[1]])
+    headings = array("d", [heading])
+    # Everything grown from a tip fits in a circle of this size times the
+    # length of the tip's first branch
+    reach = 1 / (1 - scale) if viewport is not None and 0 < scale < 1 else None
+
+    for _ in range(level):
+        if not xs or (min_length is not None and length < min_length):
+            break
+        next_xs = array("d")
+        next_ys = array("d")
+        next_headings = array("d")
+        for x, y, branch_heading in zip(xs, ys, headings):
+            if reach is not None and _circle_outside(viewport, x, y, length * reach):
+                continue
+            radians = math.radians(branch_heading)
+            end_x = x + length * math.cos(radians)
+            end_y = y + length * math.sin(radians)
+            if viewport is None or not _box_outside(viewport, x, y, end_x, end_y, 0):
+                segments.extend((x, y, end_x, end_y))
+            next_xs.extend((end_x, end_x))
+            next_ys.extend((end_y, end_y))
+            next_headings.extend((branch_heading - right_angle, branch_heading + left_angle))
+        xs, ys, headings = next_xs, next_ys, next_headings
+        length *= scale
+
+    return segments
+
+
+def koch_points(level, start=(-200, 0), end=(200, 0), min_length=None, viewport=None):
+    """
+    Compute one Koch curve as a polyline.
+
+    Every level replaces each segment with four: the first third, two sides
+    of an equilateral bump on the left of the direction of travel, and the
+    last third.
+
+    With level of detail, segments shorter than min_length pixels and
+    segments whose finished curve would lie outside the viewport are left
+    as straight lines, and the loop ends early once nothing changes.
+
+    Args:
+        level (int): Recursion level; level 0 is a straight line
+        start (tuple): (x, y) where the curve starts
+        end (tuple): (x, y) where the curve ends
+        min_length (float, optional): Shortest segment worth subdividing
+        viewport (tuple, optional): Visible (xmin, ymin, xmax, ymax)
+
+    Returns:
+        array: Flat x, y coordinates of at most 4**level + 1 points
+    """
+    points = array("d", start + end)
+    # Rotating by +60 degrees puts the bump on the left, like t.left(60)
+    cos60 = 0.5
+    sin60 = math.sqrt(3) / 2
+    min_squared = min_length * min_length if min_length is not None else None
+
+    for _ in range(level):
+        next_points = array("d")
+        subdivided = False
+        for i in range(0, len(points) - 2, 2):
+            x0, y0, x1, y1 = points[i:i + 4]
+            if min_squared is not None or viewport is not None:
+                length_squared = (x1 - x0) ** 2 + (y1 - y0) ** 2
+                if ((min_squared is not None and length_squared < min_squared)
+                        or (viewport is not None and _box_outside(
+                            viewport, x0, y0, x1, y1, KOCH_HEIGHT * math.sqrt(length_squared)))):
+                    next_points.extend((x0, y0))
+                    continue
+            subdivided = True
+            dx = (x1 - x0) / 3
+            dy = (y1 - y0) / 3
+            ax, ay = x0 + dx, y0 + dy
+            next_points.extend((
+                x0, y0,
+                ax, ay,
+                ax + dx * cos60 - dy * sin60, ay + dx * sin60 + dy * cos60,
+                x0 + 2 * dx, y0 + 2 * dy,
+            ))
+        if not subdivided:
+            break
+        next_points.extend(points[-2:])
+        points = next_points
+
+    return points
+
+
+def koch_snowflake_points(level, length=400, origin=(-200, 0), min_length=None, viewport=None):
+    """
+    Compute the Koch snowflake drawn by draw_fractal_menu.
+
+    The snowflake is three Koch curves along the sides of a triangle, with
+    the turtle turning right by 120 degrees after each side.
+
+    Args:
+        level (int): Recursion level of each side
+        length (float): Length of each side of the triangle
+        origin (tuple): (x, y) of the first corner
+        min_length (float, optional): Shortest segment worth subdividing
+        viewport (tuple, optional): Visible (xmin, ymin, xmax, ymax)
+
+    Returns:
+        array: Flat x, y coordinates of a closed polyline
+    """
+    corners = [origin]
+    heading = 0
+    for _ in range(3):
+        x, y = corners[-1]
+        radians = math.radians(heading)
+        corners.append((x + length * math.cos(radians), y + length * math.sin(radians)))
+        heading -= 120
+
+    points = array("d")
+    for side in range(3):
+        side_points = koch_points(level, corners[side], corners[side + 1], min_length, viewport)
+        # Each side starts where the previous one ended
+        points.extend(side_points if side == 0 else side_points[2:])
+    return points
+
+
+def polyline_segments(points):
+    """
+    Convert a polyline into separate segments.
+
+    Args:
+        points (array): Flat x, y coordinates
+
+    Returns:
+        array: Flat x0, y0, x1, y1 coordinates
+    """
+    segments = array("d")
+    for i in range(0, len(points) - 2, 2):
+        segments.extend(points[i:i + 4])
+    return segments
+
+
+def svg_document(segments=None, polyline=None, width=CANVAS_WIDTH, height=CANVAS_HEIGHT,
+                 stroke="green", stroke_width=2, background="white"):
+    """
+    Build an SVG document for segments and/or a polyline.
+
+    Args:
+        segments (array, optional): Flat x0, y0, x1, y1 coordinates
+        polyline (array, optional): Flat x, y coordinates
+        width (int): Canvas width in pixels
+        height (int): Canvas height in pixels
+        stroke (str): Line colour
+        stroke_width (float): Line width in pixels
+        background (str): Canvas colour
+
+    Returns:
+        str: The SVG document
+    """
+    half_width = width / 2
+    half_height = height / 2
+    commands = []
+
+    if segments is not None:
+        for i in range(0, len(segments), 4):
+            x0, y0, x1, y1 = segments[i:i + 4]
+            commands.append(f"M{x0 + half_width:.2f} {half_height - y0:.2f}"
+                            f"L{x1 + half_width:.2f} {half_height - y1:.2f}")
+    if polyline is not None:
+        commands.append("M" + "L".join(
+            f"{polyline[i] + half_width:.2f} {half_height - polyline[i + 1]:.2f}"
+            for i in range(0, len(polyline), 2)
+        ))
+
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}">\n'
+        f'<rect width="100%" height="100%" fill="{background}"/>\n'
+        f'<path d="{"".join(commands)}" fill="none" stroke="{stroke}" '
+        f'stroke-width="{stroke_width}" stroke-linecap="round" stroke-linejoin="round"/>\n'
+        "</svg>\n"
+    )
+
+
+def rasterize(segments, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, mask=None, zoom=1.0, rows=None):
+    """
+    Draw segments into a one-byte-per-pixel mask.
+
+    Each segment is sampled once per pixel along its longer axis, and every
+    covered pixel is set to 1.
+
+    Args:
+        segments (array): Flat x0, y0, x1, y1 coordinates
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        mask (bytearray, optional): Existing mask to draw into
+        zoom (float): Pixels per coordinate unit
+        rows (tuple, optional): (first, stop) to draw only that band of
+            image rows into a mask of (stop - first) * width bytes
+
+    Returns:
+        bytearray: The mask, row by row from the top
+    """
+    first, stop = rows if rows is not None else (0, height)
+    if mask is None:
+        mask = bytearray((stop - first) * width)
+    half_width = width / 2
+    half_height = height / 2
+
+    for i in range(0, len(segments), 4):
+        x0, y0, x1, y1 = segments[i:i + 4]
+        x0 = x0 * zoom + half_width
+        x1 = x1 * zoom + half_width
+        y0 = half_height - y0 * zoom
+        y1 = half_height - y1 * zoom
+        steps = int(max(abs(x1 - x0), abs(y1 - y0))) + 1
+        step_x = (x1 - x0) / steps
+        step_y = (y1 - y0) / steps
+        for step in range(steps + 1):
+            px = x0 + step_x * step
+            py = y0 + step_y * step
+            # Bounds are checked before truncating so int() acts as floor
+            if 0 <= px < width and first <= py < stop:
+                mask[(int(py) - first) * width + int(px)] = 1
+
+    return mask
+
+
+def _png_chunk(kind, data):
+    """Frame one PNG chunk with its length and CRC."""
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _parse_color(color):
+    """Turn a name or #rrggbb string into an (r, g, b) tuple."""
+    named = {
+        "white": (255, 255, 255), "black": (0, 0, 0), "green": (0, 128, 0),
+        "blue": (0, 0, 255), "red": (255, 0, 0),
+    }
+    if color in named:
+        return named[color]
+    if isinstance(color, str) and color.startswith("#") and len(color) == 7:
+        return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+    if isinstance(color, tuple) and len(color) == 3:
+        return color
+    raise ValueError(f"Unsupported colour {color!r}; use a basic name, #rrggbb or an (r, g, b) tuple")
+
+
+def png_bytes(mask, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, stroke="green", background="white"):
+    """
+    Encode a pixel mask as a two-colour palette PNG.
+
+    Args:
+        mask (bytearray): Pixel mask from rasterize()
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        stroke (str or tuple): Colour for pixels set to 1
+        background (str or tuple): Colour for pixels set to 0
+
+    Returns:
+        bytes: The PNG file contents
+    """
+    palette = bytes(_parse_color(background) + _parse_color(stroke))
+    rows = bytearray()
+    for row in range(height):
+        rows.append(0)  # no filter
+        rows += mask[row * width:(row + 1) * width]
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header) + _png_chunk(b"PLTE", palette)
+            + _png_chunk(b"IDAT", zlib.compress(bytes(rows), 6)) + _png_chunk(b"IEND", b""))
+
+
+def save_geometry(path, segments, width=CANVAS_WIDTH, height=CANVAS_HEIGHT, stroke="green"):
+    """
+    Save segments to an .svg or .png file, chosen by the file extension.
+
+    Raises:
+        ValueError: If the extension is not .svg or .png
+    """
+    if path.lower().endswith(".svg"):
+        with open(path, "w", encoding="utf-8") as svg_file:
+            svg_file.write(svg_document(segments, width=width, height=height, stroke=stroke))
+    elif path.lower().endswith(".png"):
+        with open(path, "wb") as png_file:
+            png_file.write(png_bytes(rasterize(segments, width, height), width, height, stroke))
+    else:
+        raise ValueError("Output file must end in .svg or .png")
+
+
+def fractal_segments(fractal, level, min_length=None, viewport=None):
+    """
+    Compute the segments of a named fractal with the menu's default layout.
+
+    Args:
+        fractal (str): "tree" or "snowflake"
+        level (int): Recursion level
+        min_length (float, optional): Level-of-detail pixel threshold
+        viewport (tuple, optional): Visible (xmin, ymin, xmax, ymax)
+
+    Returns:
+        array: Flat x0, y0, x1, y1 coordinates
+    """
+    if fractal == "tree":
+        return tree_segments(level, min_length=min_length, viewport=viewport)
+    if fractal == "snowflake":
+        return polyline_segments(koch_snowflake_points(level, min_length=min_length, viewport=viewport))
+    raise ValueError(f"Unknown fractal {fractal!r}")
+
+
+def main():
+    """Render a fractal to an SVG or PNG file from the command line."""
+    parser = argparse.ArgumentParser(description="Render fractals to SVG or PNG without a display")
+    parser.add_argument("fractal", choices=["tree", "snowflake"])
+    parser.add_argument("level", type=int)
+    parser.add_argument("output", help="Output file ending in .svg or .png")
+    parser.add_argument("--width", type=int, default=CANVAS_WIDTH)
+    parser.add_argument("--height", type=int, default=CANVAS_HEIGHT)
+    parser.add_argument("--min-length", type=float, default=MIN_PIXEL_LENGTH,
+                        help="Stop subdividing below this many pixels (default: %(default)s)")
+    parser.add_argument("--full-detail", action="store_true",
+                        help="Compute every level in full, without level-of-detail culling")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.full_detail:
+        segments = fractal_segments(args.fractal, args.level)
+    else:
+        segments = fractal_segments(args.fractal, args.level, args.min_length,
+                                    canvas_viewport(args.width, args.height))
+    computed = time.perf_counter()
+    stroke = "green" if args.fractal == "tree" else "blue"
+    save_geometry(args.output, segments, args.width, args.height, stroke)
+    finished = time.perf_counter()
+
+    print(f"{len(segments) // 4:,} segments computed in {computed - start:.3f}s, "
+          f"written to {args.output} in {finished - computed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Parallel Fractal Rendering
+This module renders large fractal images by splitting the canvas into
+horizontal bands and drawing each band in a separate process. Every worker
+computes only the geometry that can reach its band, using the viewport
+culling in fractal_geometry, and the bands are joined into one image.
+
+The result is pixel-for-pixel identical to render_serial(): a band sees the
+same segments as the full render for its rows, and rasterize() decides each
+pixel from those segments alone.
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import fractal_geometry
+
+# Bands per worker, so that busy parts of the image can be balanced
+TILES_PER_WORKER = 4
+
+
+def fit_zoom(width, height):
+    """
+    Return the zoom that fits the 800x600 menu layout onto a canvas.
+
+    Args:
+        width (int): Canvas width in pixels
+        height (int): Canvas height in pixels
+
+    Returns:
+        float: Pixels per coordinate unit
+    """
+    return min(width / fractal_geometry.CANVAS_WIDTH, height / fractal_geometry.CANVAS_HEIGHT)
+
+
+def _band_viewport(width, height, zoom, first, stop):
+    """
+    Return the (xmin, ymin, xmax, ymax) in fractal units that covers image rows first..stop.
+
+    A one-pixel margin keeps rounding in the zoom from culling geometry
+    that still touches the band.
+    """
+    margin = 1.0
+    return (
+        (-width / 2 - margin) / zoom,
+        (height / 2 - stop - margin) / zoom,
+        (width / 2 + margin) / zoom,
+        (height / 2 - first + margin) / zoom,
+    )
+
+
+def render_band(fractal, level, width, height, first, stop, min_length=fractal_geometry.MIN_PIXEL_LENGTH):
+    """
+    Render image rows first..stop of a fractal.
+
+    Args:
+        fractal (str): "tree" or "snowflake"
+        level (int): Recursion level
+        width (int): Full image width in pixels
+        height (int): Full image height in pixels
+        first (int): First row of the band
+        stop (int): Row after the last row of the band
+        min_length (float): Level-of-detail threshold in pixels
+
+    Returns:
+        bytearray: (stop - first) * width pixel mask
+    """
+    zoom = fit_zoom(width, height)
+    viewport = _band_viewport(width, height, zoom, first, stop)
+    segments = fractal_geometry.fractal_segments(fractal, level, min_length / zoom, viewport)
+    return fractal_geometry.rasterize(segments, width, height, zoom=zoom, rows=(first, stop))
+
+
+def render_serial(fractal, level, width, height, min_length=fractal_geometry.MIN_PIXEL_LENGTH):
+    """
+    Render a whole fractal image in this process.
+
+    Returns:
+        bytearray: width * height pixel mask
+    """
+    return render_band(fractal, level, width, height, 0, height, min_length)
+
+
+def _bands(height, tiles):
+    """Split height rows into at most tiles contiguous (first, stop) bands."""
+    tiles = max(1, min(tiles, height))
+    edges = [height * tile // tiles for tile in range(tiles + 1)]
+    return list(zip(edges, edges[1:]))
+
+
+def render_parallel(fractal, level, width, height, min_length=fractal_geometry.MIN_PIXEL_LENGTH,
+                    workers=None, tiles=None, pool=None):
+    """
+    Render a fractal image with bands drawn in a process pool.
+
+    Args:
+        fractal (str): "tree" or "snowflake"
+        level (int): Recursion level
+        width (int): Image width in pixels
+        height (int): Image height in pixels
+        min_length (float): Level-of-detail threshold in pixels
+        workers (int, optional): Number of processes; defaults to the CPU count
+        tiles (int, optional): Number of bands; defaults to TILES_PER_WORKER per worker
+        pool (ProcessPoolExecutor, optional): Existing pool to reuse
+
+    Returns:
+        bytearray: width * height pixel mask, identical to render_serial()
+    """
+    workers = workers or os.cpu_count() or 1
+    bands = _bands(height, tiles or workers * TILES_PER_WORKER)
+    arguments = [(fractal, level, width, height, first, stop, min_length) for first, stop in bands]
+
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=workers) as own_pool:
+            parts = list(own_pool.map(render_band, *zip(*arguments)))
+    else:
+        parts = list(pool.map(render_band, *zip(*arguments)))
+    return bytearray().join(parts)
+
+
+def main():
+    """Benchmark serial and parallel rendering across worker counts."""
+    parser = argparse.ArgumentParser(description="Benchmark parallel tiled fractal rendering")
+    parser.add_argument("fractal", choices=["tree", "snowflake"])
+    parser.add_argument("level", type=int)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    parser.add_argument("--min-length", type=float, default=fractal_geometry.MIN_PIXEL_LENGTH)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--output", help="Save the parallel render to this PNG file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    expected = render_serial(args.fractal, args.level, args.width, args.height, args.min_length)
+    serial = time.perf_counter() - start
+    print(f"serial       {serial:8.3f}s")
+
+    mask = expected
+    for workers in args.workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pool.submit(int).result()  # start a worker before timing
+            start = time.perf_counter()
+            mask = render_parallel(args.fractal, args.level, args.width, args.height,
+                                   args.min_length, workers, pool=pool)
+            elapsed = time.perf_counter() - start
+        status = "identical" if mask == expected else "DIFFERS"
+        print(f"{workers:2d} workers   {elapsed:8.3f}s  speedup {serial / elapsed:4.1f}x  {status}")
+
+    if args.output:
+        stroke = "green" if args.fractal == "tree" else "blue"
+        with open(args.output, "wb") as png_file:
+            png_file.write(fractal_geometry.png_bytes(mask, args.width, args.height, stroke))
+        print(f"Saved {args.width}x{args.height} image to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
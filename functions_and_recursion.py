@@ -4,6 +4,22 @@ Functions and Recursion Assignment
 This program demonstrates various concepts related to functions and recursion in Python.
 """
 
+import fast_math
+from memoize import memoize
+
+# Factorial and Fibonacci use the engines in fast_math.py, since the
+# naive recursions hit the recursion limit or take exponential time.
+# They live at module level so their caches last across calls.
+@memoize(maxsize=128)
+def factorial(n):
+    """Calculate n!, remembering recent results"""
+    return fast_math.factorial(n)
+
+@memoize(maxsize=128)
+def fibonacci(n):
+    """Calculate the nth Fibonacci number, remembering recent results"""
+    return fast_math.fibonacci(n)
+
 def task1_writing_functions():
     """Task 1: Demonstrate basic function creation and usage"""
     print("\n--- Task 1: Writing Functions ---")
@@ -64,29 +80,7 @@ def task4_recursion():
     """Task 4: Demonstrate recursive functions"""
     print("\n--- Task 4: Understanding Recursion ---")
     
-    # Define a recursive function to calculate factorial
-    def factorial(n):
-        """Calculate the factorial of n recursively."""
-        # Base case
-        if n <= 1:
-            return 1
-        # Recursive case
-        else:
-            return n * factorial(n - 1)
-    
-    # Define a recursive function for Fibonacci sequence
-    def fibonacci(n):
-        """Calculate the nth number in the Fibonacci sequence recursively."""
-        # Base cases
-        if n <= 0:
-            return 0
-        elif n == 1:
-            return 1
-        # Recursive case
-        else:
-            return fibonacci(n - 1) + fibonacci(n - 2)
-    
-    # Use the recursive functions
+    # Use the functions
     n_factorial = 5
     n_fibonacci = 6
     
@@ -98,8 +92,9 @@ def task4_recursion():
     
     # Demonstrate the Fibonacci sequence
     print("\nFibonacci sequence up to the 10th number:")
-    for i in range(11):
-        print(f"fibonacci({i}) = {fibonacci(i)}")
+    # Each term follows from the previous two, so walk the sequence once
+    for i, value in enumerate(fast_math.FibonacciSequence.window(0, 11)):
+        print(f"fibonacci({i}) = {value}")
 
 def main():
     """Main function to run all tasks"""
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Concurrent Inventory
+This module provides a thread-safe inventory for programs where several
+worker threads apply changes at the same time. Items are spread across lock
+stripes, so threads touching different items rarely wait for each other,
+and every check-then-act operation runs under its item's stripe lock.
+
+Run this file directly for a contention benchmark comparing one lock with
+many stripes.
+"""
+
+import argparse
+import threading
+import time
+from collections.abc import MutableMapping
+
+
+class StripedInventory(MutableMapping):
+    """
+    Inventory partitioned across independently locked stripes.
+
+    The mapping methods are individually atomic. Use add_item, update_item,
+    compare_and_update and adjust_quantity for operations that read an item
+    and then write it, since those hold the stripe lock for the whole step.
+    """
+
+    def __init__(self, items=None, stripes=16):
+        """
+        Create a striped inventory.
+
+        Args:
+            items (dict, optional): Initial items as name -> (quantity, price)
+            stripes (int): Number of lock stripes
+
+        Raises:
+            ValueError: If stripes is less than 1
+        """
+        if stripes < 1:
+            raise ValueError("A striped inventory needs at least one stripe")
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._stripes = [{} for _ in range(stripes)]
+
+        if items is not None:
+            for item_name, details in items.items():
+                self[item_name] = details
+
+    def _stripe_for(self, item_name):
+        """Return (lock, items dict) for the stripe that owns an item."""
+        stripe = hash(item_name) % len(self._stripes)
+        return self._locks[stripe], self._stripes[stripe]
+
+    def __getitem__(self, item_name):
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            return items[item_name]
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            items[item_name] = (quantity, price)
+
+    def __delitem__(self, item_name):
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            del items[item_name]
+
+    def __contains__(self, item_name):
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            return item_name in items
+
+    def __iter__(self):
+        return iter([item_name for item_name, _ in self.items()])
+
+    def __len__(self):
+        return sum(len(items) for items in self._stripes)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} items, {len(self._stripes)} stripes)"
+
+    def items(self):
+        """
+        Return a snapshot of (name, (quantity, price)) pairs.
+
+        Each stripe is copied under its own lock, one stripe at a time.
+        """
+        snapshot = []
+        for lock, items in zip(self._locks, self._stripes):
+            with lock:
+                snapshot.extend(items.items())
+        return snapshot
+
+    def add_item(self, item_name, quantity, price):
+        """
+        Atomically add an item if it does not exist yet.
+
+        Returns:
+            bool: True if the item was added, False if it already exists
+        """
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            if item_name in items:
+                return False
+            items[item_name] = (quantity, price)
+            return True
+
+    def remove_item(self, item_name):
+        """
+        Atomically remove an item.
+
+        Returns:
+            bool: True if the item was removed, False if it was not found
+        """
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            return items.pop(item_name, None) is not None
+
+    def update_item(self, item_name, quantity=None, price=None):
+        """
+        Atomically update quantity or price of an existing item.
+
+        Returns:
+            bool: True if the item was updated, False if it was not found
+        """
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            current = items.get(item_name)
+            if current is None:
+                return False
+            current_quantity, current_price = current
+            items[item_name] = (
+                quantity if quantity is not None else current_quantity,
+                price if price is not None else current_price,
+            )
+            return True
+
+    def compare_and_update(self, item_name, expected, new):
+        """
+        Replace an item's details only if they still equal what was expected.
+
+        Args:
+            item_name (str): Name of the item
+            expected (tuple): (quantity, price) the caller last saw
+            new (tuple): (quantity, price) to store
+
+        Returns:
+            bool: True if the item was updated, False if it changed or is missing
+        """
+        quantity, price = new
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            if items.get(item_name) != tuple(expected):
+                return False
+            items[item_name] = (quantity, price)
+            return True
+
+    def adjust_quantity(self, item_name, delta, allow_negative=False):
+        """
+        Atomically add delta to an item's quantity.
+
+        Args:
+            item_name (str): Name of the item
+            delta (int): Amount to add; negative to take stock out
+            allow_negative (bool): If False, refuse to go below zero
+
+        Returns:
+            int: The new quantity
+
+        Raises:
+            KeyError: If the item is not in the inventory
+            ValueError: If the change would make the quantity negative
+        """
+        lock, items = self._stripe_for(item_name)
+        with lock:
+            quantity, price = items[item_name]
+            new_quantity = quantity + delta
+            if new_quantity < 0 and not allow_negative:
+                raise ValueError(f"Not enough {item_name} in stock: have {quantity}, need {-delta}")
+            items[item_name] = (new_quantity, price)
+            return new_quantity
+
+    def total_value(self):
+        """
+        Calculate the total value of all items.
+
+        Only one stripe is locked at a time, and only long enough to copy its
+        values, so writers on other stripes are never stopped.
+
+        Returns:
+            float: Total value of inventory
+        """
+        total_value = 0
+        for lock, items in zip(self._locks, self._stripes):
+            with lock:
+                details = list(items.values())
+            total_value += sum(quantity * price for quantity, price in details)
+        return total_value
+
+
+def run_contention_benchmark(workers, stripes, items=1000, operations=200_000):
+    """
+    Time worker threads applying quantity adjustments to a shared inventory.
+
+    Args:
+        workers (int): Number of writer threads
+        stripes (int): Number of lock stripes
+        items (int): Number of distinct items
+        operations (int): Total adjustments split across the workers
+
+    Returns:
+        float: Operations per second
+    """
+    inventory = StripedInventory({f"item{i}": (1_000_000, 1.0) for i in range(items)}, stripes)
+    names = list(inventory)
+    per_worker = operations // workers
+    start_barrier = threading.Barrier(workers + 1)
+
+    def worker(offset):
+        start_barrier.wait()
+        adjust = inventory.adjust_quantity
+        for i in range(per_worker):
+            adjust(names[(offset + i * 7) % items], -1 if i % 2 else 1)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(workers)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return per_worker * workers / elapsed
+
+
+def main():
+    """Run the contention benchmark for several worker and stripe counts."""
+    parser = argparse.ArgumentParser(description="Lock contention benchmark for StripedInventory")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--stripes", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--operations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    print(f"{'workers':>8} {'stripes':>8} {'ops/sec':>12}")
+    for workers in args.workers:
+        for stripes in args.stripes:
+            rate = run_contention_benchmark(workers, stripes, operations=args.operations)
+            print(f"{workers:>8} {stripes:>8} {rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
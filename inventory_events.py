@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Inventory Change Events
+This module lets other code react to inventory changes as they happen
+instead of re-scanning the whole inventory. An ObservableInventory wraps
+any inventory and emits an InventoryEvent for every add, update and remove
+to its subscribers, either through plain callbacks or a bounded asyncio
+queue.
+"""
+
+import asyncio
+from collections import namedtuple
+from collections.abc import MutableMapping
+
+InventoryEvent = namedtuple(
+    "InventoryEvent",
+    ["sequence", "kind", "name", "old_quantity", "old_price", "new_quantity", "new_price"],
+)
+InventoryEvent.__doc__ = """
+A single change to the inventory.
+
+kind is "add", "update" or "remove". The old_* fields are None for an add
+and the new_* fields are None for a remove.
+"""
+
+ADD = "add"
+UPDATE = "update"
+REMOVE = "remove"
+
+
+class Subscription:
+    """
+    A registered consumer of inventory events.
+
+    Events are collected into batches of batch_size and handed to the
+    callback as a list. Call flush() to deliver a partial batch.
+    """
+
+    def __init__(self, inventory, callback, batch_size=1):
+        self._inventory = inventory
+        self.callback = callback
+        self.batch_size = batch_size
+        self._batch = []
+
+    def _deliver(self, event):
+        """Add one event to the batch and hand the batch over when full."""
+        self._batch.append(event)
+        if len(self._batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Deliver any events waiting in the current batch."""
+        if self._batch:
+            batch, self._batch = self._batch, []
+            self.callback(batch)
+
+    def unsubscribe(self):
+        """Deliver pending events and stop receiving new ones."""
+        self.flush()
+        self._inventory._unsubscribe(self)
+
+
+class ObservableInventory(MutableMapping):
+    """
+    Inventory wrapper that reports every change to its subscribers.
+
+    When nobody is subscribed, changes pass straight through without
+    building any events.
+    """
+
+    def __init__(self, inventory=None):
+        """
+        Wrap an inventory.
+
+        Args:
+            inventory (dict, optional): Inventory to wrap; a new dict by default
+        """
+        self._inventory = inventory if inventory is not None else {}
+        self._subscriptions = []
+        self._sequence = 0
+
+    def __getitem__(self, item_name):
+        return self._inventory[item_name]
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details
+        if not self._subscriptions:
+            self._inventory[item_name] = details
+            return
+
+        old_details = self._inventory.get(item_name)
+        self._inventory[item_name] = details
+
+        # Report what the store kept, e.g. a price rounded to cents
+        quantity, price = self._inventory[item_name]
+        if old_details is None:
+            self._emit(ADD, item_name, None, None, quantity, price)
+        else:
+            old_quantity, old_price = old_details
+            if (old_quantity, old_price) != (quantity, price):
+                self._emit(UPDATE, item_name, old_quantity, old_price, quantity, price)
+
+    def __delitem__(self, item_name):
+        if not self._subscriptions:
+            del self._inventory[item_name]
+            return
+
+        old_quantity, old_price = self._inventory[item_name]
+        del self._inventory[item_name]
+        self._emit(REMOVE, item_name, old_quantity, old_price, None, None)
+
+    def __iter__(self):
+        return iter(self._inventory)
+
+    def __len__(self):
+        return len(self._inventory)
+
+    def __contains__(self, item_name):
+        return item_name in self._inventory
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._inventory!r})"
+
+    def items(self):
+        """Return (name, (quantity, price)) pairs from the wrapped inventory."""
+        return self._inventory.items()
+
+    def total_value(self):
+        """Return the total value, using the wrapped store's own total if it has one."""
+        if hasattr(self._inventory, "total_value"):
+            return self._inventory.total_value()
+        return sum(quantity * price for quantity, price in self._inventory.values())
+
+    def _emit(self, kind, item_name, old_quantity, old_price, new_quantity, new_price):
+        """Build one event and hand it to every subscriber."""
+        self._sequence += 1
+        event = InventoryEvent(self._sequence, kind, item_name, old_quantity, old_price, new_quantity, new_price)
+        for subscription in self._subscriptions:
+            subscription._deliver(event)
+
+    def _unsubscribe(self, subscription):
+        """Remove a subscription if it is still registered."""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+
+    def subscribe(self, callback, batch_size=1):
+        """
+        Register a callback for change events.
+
+        Args:
+            callback (callable): Called with a list of InventoryEvents
+            batch_size (int): Number of events collected per call
+
+        Returns:
+            Subscription: Handle for flushing and unsubscribing
+        """
+        subscription = Subscription(self, callback, batch_size)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def subscribe_queue(self, maxsize=1000, batch_size=100):
+        """
+        Register a bounded asyncio queue of event batches.
+
+        Must be called from the thread running the event loop.
+
+        Args:
+            maxsize (int): Maximum number of batches waiting in the queue
+            batch_size (int): Number of events per batch
+
+        Returns:
+            EventStream: Async iterator over event batches
+        """
+        stream = EventStream(maxsize)
+        stream.subscription = self.subscribe(stream._put, batch_size)
+        return stream
+
+    def flush(self):
+        """Deliver every subscriber's partial batch."""
+        for subscription in list(self._subscriptions):
+            subscription.flush()
+
+
+class EventStream:
+    """
+    Bounded asyncio queue of event batches with backpressure.
+
+    Inventory changes are synchronous, so they can never block on a full
+    queue. Async producers should await wait_for_capacity() before making
+    changes. If the queue still fills up, new batches are dropped and
+    counted, and the consumer should rebuild its view from the inventory.
+    """
+
+    def __init__(self, maxsize):
+        self._queue = asyncio.Queue(maxsize)
+        self._space = asyncio.Event()
+        self._space.set()
+        self.dropped = 0
+        self.subscription = None
+
+    def _put(self, batch):
+        """Queue a batch, or drop it when the consumer has fallen behind."""
+        try:
+            self._queue.put_nowait(batch)
+        except asyncio.QueueFull:
+            self.dropped += len(batch)
+        if self._queue.full():
+            self._space.clear()
+
+    async def wait_for_capacity(self):
+        """Wait until the queue has room for another batch."""
+        await self._space.wait()
+
+    async def get(self):
+        """
+        Wait for the next batch of events.
+
+        Returns:
+            list: InventoryEvents in the order they happened
+        """
+        batch = await self._queue.get()
+        if not self._queue.full():
+            self._space.set()
+        return batch
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.get()
+
+    def close(self):
+        """Stop receiving events."""
+        if self.subscription is not None:
+            self.subscription.unsubscribe()
+            self.subscription = None
+
+
+class LowStockView:
+    """
+    Derived view of low-stock items maintained from change events.
+
+    Subscribe it with inventory.subscribe(view) and it keeps the set of
+    items whose quantity is below the threshold without ever re-scanning.
+    """
+
+    def __init__(self, inventory, threshold=5):
+        self.threshold = threshold
+        self.items = {name for name, (quantity, _) in inventory.items() if quantity < threshold}
+
+    def __call__(self, events):
+        for event in events:
+            if event.kind != REMOVE and event.new_quantity < self.threshold:
+                self.items.add(event.name)
+            else:
+                self.items.discard(event.name)
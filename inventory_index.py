@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Indexed Inventory
+This module provides an inventory with optional sorted secondary indexes on
+quantity, price and line value (quantity * price). The indexes are kept in
+sync on every add, update and remove, so range, threshold and top-k queries
+use binary search instead of scanning every item.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import MutableMapping
+from operator import itemgetter
+
+# How each indexable field is computed from an item's (quantity, price)
+INDEX_FIELDS = {
+    "quantity": lambda details: details[0],
+    "price": lambda details: details[1],
+    "value": lambda details: details[0] * details[1],
+}
+
+_index_key = itemgetter(0)
+
+
+class IndexedInventory(MutableMapping):
+    """
+    Inventory with opt-in sorted indexes.
+
+    Each index is a list of (key, item name) pairs kept in sorted order.
+    Queries return (item name, (quantity, price)) pairs ordered by the
+    indexed field.
+    """
+
+    def __init__(self, items=None, indexes=("quantity", "price", "value")):
+        """
+        Create an indexed inventory.
+
+        Args:
+            items (dict, optional): Initial items as name -> (quantity, price)
+            indexes (iterable): Fields to index, any of "quantity", "price"
+                and "value"
+
+        Raises:
+            ValueError: If an unknown field is requested
+        """
+        for field in indexes:
+            if field not in INDEX_FIELDS:
+                raise ValueError(f"Cannot index unknown field {field!r}")
+
+        self._items = {}
+        self._indexes = {field: [] for field in indexes}
+
+        if items is not None:
+            # Build every index with one sort instead of repeated inserts
+            self._items = {name: (quantity, price) for name, (quantity, price) in items.items()}
+            for field, index in self._indexes.items():
+                key = INDEX_FIELDS[field]
+                index.extend((key(details), name) for name, details in self._items.items())
+                index.sort()
+
+    def __getitem__(self, item_name):
+        return self._items[item_name]
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details
+        details = (quantity, price)
+        old_details = self._items.get(item_name)
+
+        # Compute every key first, so a key that cannot be computed leaves
+        # the indexes untouched
+        changes = [
+            (index,
+             None if old_details is None else (INDEX_FIELDS[field](old_details), item_name),
+             (INDEX_FIELDS[field](details), item_name))
+            for field, index in self._indexes.items()
+        ]
+
+        # Insert the new entries before removing any old one, so a key that
+        # cannot be compared with the others only has insertions to undo
+        inserted = []
+        try:
+            for index, _, new_entry in changes:
+                insort(index, new_entry)
+                inserted.append((index, new_entry))
+        except TypeError:
+            for index, new_entry in inserted:
+                self._remove_entry(index, new_entry)
+            raise
+        for index, old_entry, _ in changes:
+            if old_entry is not None:
+                self._remove_entry(index, old_entry)
+
+        self._items[item_name] = details
+
+    def __delitem__(self, item_name):
+        details = self._items.pop(item_name)
+        for field, index in self._indexes.items():
+            self._remove_entry(index, (INDEX_FIELDS[field](details), item_name))
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_name):
+        return item_name in self._items
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} items, indexes={list(self._indexes)})"
+
+    def items(self):
+        """Return (name, (quantity, price)) pairs in insertion order."""
+        return self._items.items()
+
+    @staticmethod
+    def _remove_entry(index, entry):
+        """Delete one (key, name) entry from a sorted index."""
+        position = bisect_left(index, entry)
+        if position < len(index) and index[position] == entry:
+            del index[position]
+
+    def _get_index(self, field):
+        """Return the sorted index for a field, or raise if it is not indexed."""
+        try:
+            return self._indexes[field]
+        except KeyError:
+            raise ValueError(f"Field {field!r} is not indexed") from None
+
+    def _entries(self, index, start, stop, reverse=False):
+        """Turn a slice of an index into (name, details) pairs."""
+        entries = index[start:stop]
+        if reverse:
+            entries.reverse()
+        return [(name, self._items[name]) for _, name in entries]
+
+    def range_query(self, field, low=None, high=None):
+        """
+        Find items whose field lies between low and high, inclusive.
+
+        Args:
+            field (str): "quantity", "price" or "value"
+            low (float, optional): Lower bound. If None, there is no lower bound.
+            high (float, optional): Upper bound. If None, there is no upper bound.
+
+        Returns:
+            list: (name, (quantity, price)) pairs in ascending field order
+        """
+        index = self._get_index(field)
+        start = 0 if low is None else bisect_left(index, low, key=_index_key)
+        stop = len(index) if high is None else bisect_right(index, high, key=_index_key)
+        return self._entries(index, start, stop)
+
+    def below(self, field, threshold):
+        """
+        Find items whose field is strictly below a threshold.
+
+        For example, below("quantity", 5) lists every low-stock item.
+
+        Returns:
+            list: (name, (quantity, price)) pairs in ascending field order
+        """
+        index = self._get_index(field)
+        return self._entries(index, 0, bisect_left(index, threshold, key=_index_key))
+
+    def above(self, field, threshold):
+        """
+        Find items whose field is strictly above a threshold.
+
+        Returns:
+            list: (name, (quantity, price)) pairs in ascending field order
+        """
+        index = self._get_index(field)
+        return self._entries(index, bisect_right(index, threshold, key=_index_key), len(index))
+
+    def count_range(self, field, low=None, high=None):
+        """
+        Count items whose field lies between low and high, inclusive.
+
+        Returns:
+            int: Number of matching items
+        """
+        index = self._get_index(field)
+        start = 0 if low is None else bisect_left(index, low, key=_index_key)
+        stop = len(index) if high is None else bisect_right(index, high, key=_index_key)
+        return max(stop - start, 0)
+
+    def top_k(self, field, k, largest=True):
+        """
+        Find the k items with the largest (or smallest) field.
+
+        Args:
+            field (str): "quantity", "price" or "value"
+            k (int): Number of items to return
+            largest (bool): If False, return the k smallest instead
+
+        Returns:
+            list: (name, (quantity, price)) pairs, best first
+        """
+        index = self._get_index(field)
+        k = max(min(k, len(index)), 0)
+        if largest:
+            return self._entries(index, len(index) - k, len(index), reverse=True)
+        return self._entries(index, 0, k)
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+Inventory Import and Export
+This module streams inventories to and from CSV and JSON Lines files. Files
+are processed in fixed-size chunks, so memory use does not grow with the
+file. Bad rows are collected in the report instead of stopping the import.
+
+CSV files have a header row of name,quantity,price. JSON Lines files have
+one {"name": ..., "quantity": ..., "price": ...} object per line.
+"""
+
+import argparse
+import csv
+import json
+import math
+from itertools import islice
+
+from inventory_manager import calculate_total_value
+from inventory_persistence import DurableInventory
+
+DEFAULT_CHUNK_SIZE = 10_000
+CSV_HEADER = ["name", "quantity", "price"]
+
+
+def parse_quantity(value):
+    """
+    Convert a quantity field to an int, as the interactive menu does.
+
+    Raises:
+        ValueError: If the value is not a whole number
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"Quantity must be an integer, got {value!r}")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        return int(value)
+    raise ValueError(f"Quantity must be an integer, got {value!r}")
+
+
+def parse_price(value):
+    """
+    Convert a price field to a float, as the interactive menu does.
+
+    Raises:
+        ValueError: If the value is not a finite number
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f"Price must be a number, got {value!r}")
+    try:
+        price = float(value)
+    except OverflowError:
+        raise ValueError("Price is too large to store as a float") from None
+    if not math.isfinite(price):
+        raise ValueError(f"Price must be a finite number, got {value!r}")
+    return price
+
+
+def _new_import_report():
+    """Create an empty report for an import."""
+    return {
+        "rows": 0,
+        "imported": 0,
+        "conflicts": 0,
+        "errors": [],
+        "error_count": 0,
+    }
+
+
+def _record_error(report, line_number, message, max_errors):
+    """Count a bad row and keep its details if there is room."""
+    report["error_count"] += 1
+    if len(report["errors"]) < max_errors:
+        report["errors"].append((line_number, message))
+
+
+def _apply_chunk(inventory, records, upsert, report, max_errors):
+    """
+    Apply one chunk of valid (line number, name, quantity, price) records.
+
+    Records are applied in file order, so with upsert a name repeated in
+    the file ends up with its last row however the rows fall into chunks.
+    """
+    for line_number, item_name, quantity, price in records:
+        if not upsert and item_name in inventory:
+            report["conflicts"] += 1
+            continue
+        try:
+            inventory[item_name] = (quantity, price)
+        except (TypeError, ValueError, OverflowError) as e:
+            # The store can still reject a valid row, e.g. a quantity too
+            # large for a 64-bit column
+            _record_error(report, line_number, str(e), max_errors)
+            continue
+        report["imported"] += 1
+
+
+def _import_rows(inventory, rows, chunk_size, upsert, max_errors, report):
+    """
+    Validate and apply (line number, name, quantity, price) rows in chunks.
+
+    Returns:
+        dict: The updated import report
+    """
+    records = []
+
+    for line_number, item_name, quantity, price in rows:
+        report["rows"] += 1
+        try:
+            if not isinstance(item_name, str) or not item_name:
+                raise ValueError("Item name must be a non-empty string")
+            records.append((line_number, item_name, parse_quantity(quantity), parse_price(price)))
+        except ValueError as e:
+            _record_error(report, line_number, str(e), max_errors)
+            continue
+
+        if len(records) >= chunk_size:
+            _apply_chunk(inventory, records, upsert, report, max_errors)
+            records = []
+
+    _apply_chunk(inventory, records, upsert, report, max_errors)
+    return report
+
+
+def import_csv(inventory, path, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False, max_errors=1000):
+    """
+    Load items from a CSV file into the inventory.
+
+    Args:
+        inventory (dict): The inventory dictionary
+        path (str): CSV file with a name,quantity,price header
+        chunk_size (int): Rows validated and applied per batch
+        upsert (bool): If True, rows for existing items update them;
+            otherwise they are counted as conflicts
+        max_errors (int): Maximum number of error details kept in the report
+
+    Returns:
+        dict: Report with row, import, conflict and error counts, plus
+              (line number, message) pairs for the first max_errors bad rows
+    """
+    report = _new_import_report()
+
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header is None:
+            return report
+        columns = [column.strip().lower() for column in header]
+        try:
+            positions = [columns.index(column) for column in CSV_HEADER]
+        except ValueError:
+            raise ValueError(f"CSV header must contain {', '.join(CSV_HEADER)}") from None
+        width = max(positions) + 1
+        name_at, quantity_at, price_at = positions
+
+        def rows():
+            for line_number, row in enumerate(reader, start=2):
+                if not row:
+                    continue
+                if len(row) < width:
+                    report["rows"] += 1
+                    _record_error(report, line_number, f"Expected {width} columns, got {len(row)}", max_errors)
+                    continue
+                yield line_number, row[name_at], row[quantity_at], row[price_at]
+
+        return _import_rows(inventory, rows(), chunk_size, upsert, max_errors, report)
+
+
+def import_jsonl(inventory, path, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False, max_errors=1000):
+    """
+    Load items from a JSON Lines file into the inventory.
+
+    Args and return value are the same as for import_csv.
+    """
+    report = _new_import_report()
+
+    def rows():
+        with open(path, encoding="utf-8") as jsonl_file:
+            for line_number, line in enumerate(jsonl_file, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    fields = (record["name"], record["quantity"], record["price"])
+                except (ValueError, KeyError, TypeError) as e:
+                    report["rows"] += 1
+                    _record_error(report, line_number, f"Invalid record: {e!r}", max_errors)
+                    continue
+                yield (line_number,) + fields
+
+    return _import_rows(inventory, rows(), chunk_size, upsert, max_errors, report)
+
+
+def _chunks(inventory, chunk_size):
+    """Yield lists of (name, (quantity, price)) pairs from the inventory."""
+    items = iter(inventory.items())
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_csv(inventory, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write the inventory to a CSV file.
+
+    Args:
+        inventory (dict): The inventory dictionary
+        path (str): Destination file
+        chunk_size (int): Rows formatted and written per batch
+
+    Returns:
+        int: Number of rows written
+    """
+    written = 0
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(CSV_HEADER)
+        for chunk in _chunks(inventory, chunk_size):
+            writer.writerows((item_name, quantity, repr(price)) for item_name, (quantity, price) in chunk)
+            written += len(chunk)
+    return written
+
+
+def export_jsonl(inventory, path, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Write the inventory to a JSON Lines file.
+
+    Args:
+        inventory (dict): The inventory dictionary
+        path (str): Destination file
+        chunk_size (int): Lines formatted and written per batch
+
+    Returns:
+        int: Number of lines written
+
+    Raises:
+        ValueError: If an item's price is inf or nan
+    """
+    written = 0
+    encode_name = json.encoder.encode_basestring_ascii
+    with open(path, "w", encoding="utf-8") as jsonl_file:
+        for chunk in _chunks(inventory, chunk_size):
+            # repr() would write inf and nan, which are not valid JSON
+            for item_name, (_, price) in chunk:
+                if not math.isfinite(price):
+                    raise ValueError(f"Price of {item_name!r} is {price!r}, which JSON cannot represent")
+            jsonl_file.write("".join(
+                f'{{"name": {encode_name(item_name)}, "quantity": {quantity}, "price": {price!r}}}\n'
+                for item_name, (quantity, price) in chunk
+            ))
+            written += len(chunk)
+    return written
+
+
+def _file_format(path, requested):
+    """Pick csv or jsonl from an explicit choice or the file extension."""
+    if requested:
+        return requested
+    return "jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def main():
+    """Import a file into a stored inventory, or export one to a file."""
+    parser = argparse.ArgumentParser(description="Import or export an inventory as CSV or JSON Lines")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", help="File to read or write")
+    parser.add_argument("--data-dir", required=True, help="Directory of the stored inventory")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Defaults to the file extension")
+    parser.add_argument("--upsert", action="store_true", help="Update items that already exist")
+    args = parser.parse_args()
+
+    file_format = _file_format(args.path, args.format)
+    with DurableInventory(args.data_dir) as inventory:
+        if args.action == "import":
+            importer = import_jsonl if file_format == "jsonl" else import_csv
+            report = importer(inventory, args.path, upsert=args.upsert)
+            print(f"Imported {report['imported']} of {report['rows']} rows "
+                  f"({report['conflicts']} conflicts, {report['error_count']} errors).")
+            for line_number, message in report["errors"][:10]:
+                print(f"  line {line_number}: {message}")
+            print(f"Total value of inventory: ${calculate_total_value(inventory):.2f}")
+        else:
+            exporter = export_jsonl if file_format == "jsonl" else export_csv
+            written = exporter(inventory, args.path)
+            print(f"Exported {written} items to {args.path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Inventory Load Generator
+This program drives a running inventory_server.py with many concurrent,
+pipelined connections and reports throughput and latency percentiles.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from inventory_server import DEFAULT_HOST, DEFAULT_PORT
+
+
+def percentile(sorted_values, fraction):
+    """
+    Return the value at a fraction (0-1) of a sorted list.
+
+    Args:
+        sorted_values (list): Values in ascending order
+        fraction (float): 0.5 for the median, 0.99 for p99, and so on
+
+    Returns:
+        float: The selected value, or 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def make_request(request_id, items, rng):
+    """Build one request from a mix of mostly updates with some reads."""
+    roll = rng.random()
+    item_name = f"item{rng.randrange(items)}"
+    if roll < 0.6:
+        return {"id": request_id, "op": "update", "name": item_name, "quantity": rng.randrange(100)}
+    if roll < 0.8:
+        return {"id": request_id, "op": "get", "name": item_name}
+    return {"id": request_id, "op": "total"}
+
+
+async def run_connection(host, port, requests, pipeline, items, seed, latencies):
+    """
+    Send requests over one connection, keeping up to pipeline of them in flight.
+
+    Args:
+        host (str): Server host
+        port (int): Server port
+        requests (int): Number of requests to send
+        pipeline (int): Maximum requests awaiting a response
+        items (int): Number of distinct item names to use
+        seed (int): Random seed for this connection
+        latencies (list): Per-request latencies in seconds are appended here
+
+    Returns:
+        int: Number of error responses
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    in_flight = asyncio.Semaphore(pipeline)
+    sent_at = {}
+    errors = 0
+
+    async def receive():
+        nonlocal errors
+        for _ in range(requests):
+            line = await reader.readline()
+            response = json.loads(line)
+            latencies.append(time.perf_counter() - sent_at.pop(response["id"]))
+            if not response["ok"]:
+                errors += 1
+            in_flight.release()
+
+    receiver = asyncio.create_task(receive())
+    for request_id in range(requests):
+        await in_flight.acquire()
+        sent_at[request_id] = time.perf_counter()
+        writer.write(json.dumps(make_request(request_id, items, rng)).encode("utf-8") + b"\n")
+        if in_flight.locked():
+            await writer.drain()
+    await writer.drain()
+    await receiver
+
+    writer.close()
+    await writer.wait_closed()
+    return errors
+
+
+async def seed_inventory(host, port, items):
+    """Add the items the load will update, ignoring ones that already exist."""
+    reader, writer = await asyncio.open_connection(host, port)
+    for i in range(items):
+        request = {"id": i, "op": "add", "name": f"item{i}", "quantity": 10, "price": 1.0}
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+    await writer.drain()
+    for _ in range(items):
+        await reader.readline()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(host, port, connections, requests, pipeline, items):
+    """
+    Run the whole load test.
+
+    Returns:
+        dict: Requests per second, p50 and p99 latency in milliseconds,
+              total requests and errors
+    """
+    await seed_inventory(host, port, items)
+
+    latencies = []
+    per_connection = requests // connections
+    start = time.perf_counter()
+    errors = await asyncio.gather(*(
+        run_connection(host, port, per_connection, pipeline, items, seed, latencies)
+        for seed in range(connections)
+    ))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    """Parse command-line options, run the load and print the results."""
+    parser = argparse.ArgumentParser(description="Load generator for inventory_server.py")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=100_000)
+    parser.add_argument("--pipeline", type=int, default=32)
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(
+        args.host, args.port, args.connections, args.requests, args.pipeline, args.items
+    ))
+
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print(f"Requests:     {results['requests']} ({results['errors']} errors)")
+        print(f"Throughput:   {results['requests_per_second']:,.0f} requests/sec")
+        print(f"Latency p50:  {results['p50_ms']:.2f} ms")
+        print(f"Latency p99:  {results['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,21 +4,115 @@ Inventory Management System
 This program demonstrates a simple inventory management system using dictionaries and tuples.
 """
 
-def display_inventory(inventory):
+import argparse
+import heapq
+import json
+import math
+import sys
+import time
+from itertools import islice
+from operator import itemgetter
+
+from inventory_persistence import DurableInventory
+from inventory_store import IncrementalInventory
+
+# Columns of a rendered row that can be used for sorting and filtering
+ROW_FIELDS = {"name": 0, "quantity": 1, "price": 2, "value": 3}
+
+def iter_inventory_rows(inventory, sort_by=None, reverse=False, name_contains=None,
+                        ranges=None, limit=None, offset=0):
     """
-    Display all items in the inventory in a formatted way.
+    Lazily produce (name, quantity, price, value) rows from the inventory.
+    
+    Without sort_by, rows are produced in inventory order and only as many
+    items are visited as needed to fill the page. With sort_by and a limit,
+    only the top offset + limit rows are kept instead of sorting everything.
     
     Args:
         inventory (dict): The inventory dictionary
+        sort_by (str, optional): "name", "quantity", "price" or "value"
+        reverse (bool): Sort in descending order
+        name_contains (str, optional): Only include names containing this text
+        ranges (dict, optional): Field name -> (low, high) inclusive bounds;
+            either bound may be None
+        limit (int, optional): Maximum number of rows to produce
+        offset (int): Number of matching rows to skip first
+    
+    Yields:
+        tuple: (name, quantity, price, value)
+    
+    Raises:
+        ValueError: If sort_by or a range names an unknown field
+    """
+    for field in [sort_by] + list(ranges or ()):
+        if field is not None and field not in ROW_FIELDS:
+            raise ValueError(f"Unknown field {field!r}; use one of {', '.join(ROW_FIELDS)}")
+    
+    bounds = [(ROW_FIELDS[field], low, high) for field, (low, high) in (ranges or {}).items()]
+    
+    def matching_rows():
+        for item, (quantity, price) in inventory.items():
+            if name_contains is not None and name_contains not in item:
+                continue
+            row = (item, quantity, price, quantity * price)
+            if all((low is None or row[column] >= low) and (high is None or row[column] <= high)
+                   for column, low, high in bounds):
+                yield row
+    
+    rows = matching_rows()
+    if sort_by is not None:
+        key = itemgetter(ROW_FIELDS[sort_by])
+        if limit is None:
+            rows = iter(sorted(rows, key=key, reverse=reverse))
+        else:
+            pick = heapq.nlargest if reverse else heapq.nsmallest
+            rows = iter(pick(offset + limit, rows, key=key))
+    
+    stop = None if limit is None else offset + limit
+    yield from islice(rows, offset, stop)
+
+def render_inventory(inventory, **options):
+    """
+    Format inventory rows into a single string.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        **options: Any keyword accepted by iter_inventory_rows
+    
+    Returns:
+        str: One line per row, in the same format as display_inventory
+    """
+    return "".join(
+        f"Item: {item}, Quantity: {quantity}, Price: ${price:.2f}\n"
+        for item, quantity, price, _ in iter_inventory_rows(inventory, **options)
+    )
+
+def display_inventory(inventory, **options):
+    """
+    Display items in the inventory in a formatted way.
+    
+    The rows are formatted first and written in one go, which is much faster
+    than printing each item on a large inventory.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        **options: Paging, sorting and filtering keywords accepted by
+            iter_inventory_rows, such as limit=20, offset=40, sort_by="value"
     """
     print("\nCurrent inventory:")
     if not inventory:
         print("Inventory is empty!")
         return
     
-    for item, details in inventory.items():
-        quantity, price = details
-        print(f"Item: {item}, Quantity: {quantity}, Price: ${price:.2f}")
+    text = render_inventory(inventory, **options)
+    if not text and options:
+        text = "No items match.\n"
+    sys.stdout.write(text)
+    
+    limit = options.get("limit")
+    if limit is not None and len(inventory) > limit:
+        offset = options.get("offset", 0)
+        print(f"(page starting at row {offset + 1}, up to {limit} rows; {len(inventory)} items in total)")
 
 def add_item(inventory, item_name, quantity, price):
     """
@@ -98,6 +192,10 @@ def calculate_total_value(inventory):
     Returns:
         float: Total value of inventory
     """
+    # Storage engines from inventory_store.py know how to total themselves
+    if hasattr(inventory, "total_value"):
+        return inventory.total_value()
+    
     total_value = 0
     
     for item, details in inventory.items():
@@ -107,49 +205,420 @@ def calculate_total_value(inventory):
     
     return total_value
 
-def main():
+def _new_batch_report(operation):
+    """Create an empty summary report for a batch operation."""
+    return {
+        "operation": operation,
+        "succeeded": 0,
+        "conflicts": [],
+        "missing": [],
+        "applied": True,
+    }
+
+def add_items(inventory, records, atomic=False):
+    """
+    Add many new items to the inventory in one pass without per-item output.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        records (iterable): (item_name, quantity, price) records
+        atomic (bool): If True, nothing is added unless every record succeeds
+    
+    Returns:
+        dict: Summary report. "conflicts" lists names that already existed.
+    
+    Raises:
+        TypeError, ValueError, OverflowError: If the inventory rejects a
+            value. In atomic mode the items added before it are removed first.
+    """
+    report = _new_batch_report("add")
+    conflicts = report["conflicts"]
+    
+    if atomic:
+        records = list(records)
+        seen = set()
+        for item_name, _, _ in records:
+            if item_name in inventory or item_name in seen:
+                conflicts.append(item_name)
+            seen.add(item_name)
+        if conflicts:
+            report["applied"] = False
+            return report
+        
+        # Names were checked above, but the store can still reject a value
+        try:
+            for index, (item_name, quantity, price) in enumerate(records):
+                inventory[item_name] = (quantity, price)
+        except Exception:
+            for item_name, _, _ in records[:index]:
+                del inventory[item_name]
+            raise
+        report["succeeded"] = len(records)
+        return report
+    
+    succeeded = 0
+    for item_name, quantity, price in records:
+        if item_name in inventory:
+            conflicts.append(item_name)
+            continue
+        inventory[item_name] = (quantity, price)
+        succeeded += 1
+    
+    report["succeeded"] = succeeded
+    return report
+
+def update_items(inventory, records, atomic=False):
+    """
+    Update many existing items in one pass without per-item output.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        records (iterable): (item_name, quantity, price) records. A quantity
+            or price of None keeps the original value, as in update_item.
+        atomic (bool): If True, nothing is updated unless every item exists
+            and every new value is stored
+    
+    Returns:
+        dict: Summary report. "missing" lists names not in the inventory.
+    
+    Raises:
+        TypeError, ValueError, OverflowError: If the inventory rejects a
+            value. In atomic mode the items updated before it get their old
+            values back first.
+    """
+    report = _new_batch_report("update")
+    missing = report["missing"]
+    
+    if atomic:
+        records = list(records)
+        missing.extend(item_name for item_name, _, _ in records if item_name not in inventory)
+        if missing:
+            report["applied"] = False
+            return report
+        
+        # Names were checked above, but the store can still reject a value
+        previous = []
+        try:
+            for item_name, quantity, price in records:
+                current_quantity, current_price = inventory[item_name]
+                previous.append((item_name, (current_quantity, current_price)))
+                inventory[item_name] = (
+                    current_quantity if quantity is None else quantity,
+                    current_price if price is None else price,
+                )
+        except Exception:
+            # Restore newest first, so a name updated twice ends at its original
+            for item_name, details in reversed(previous):
+                inventory[item_name] = details
+            raise
+        report["succeeded"] = len(records)
+        return report
+    
+    succeeded = 0
+    for item_name, quantity, price in records:
+        if item_name not in inventory:
+            missing.append(item_name)
+            continue
+        
+        # Update only the provided values
+        if quantity is None or price is None:
+            current_quantity, current_price = inventory[item_name]
+            if quantity is None:
+                quantity = current_quantity
+            if price is None:
+                price = current_price
+        inventory[item_name] = (quantity, price)
+        succeeded += 1
+    
+    report["succeeded"] = succeeded
+    return report
+
+def remove_items(inventory, item_names, atomic=False):
+    """
+    Remove many items from the inventory in one pass without per-item output.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        item_names (iterable): Names of the items to remove
+        atomic (bool): If True, nothing is removed unless every item exists
+            and is named only once
+    
+    Returns:
+        dict: Summary report. "missing" lists names not in the inventory.
+              In atomic mode "conflicts" lists names given more than once.
+    """
+    report = _new_batch_report("remove")
+    missing = report["missing"]
+    
+    if atomic:
+        item_names = list(item_names)
+        seen = set()
+        for item_name in item_names:
+            if item_name not in inventory:
+                missing.append(item_name)
+            elif item_name in seen:
+                report["conflicts"].append(item_name)
+            seen.add(item_name)
+        if missing or report["conflicts"]:
+            report["applied"] = False
+            return report
+    
+    succeeded = 0
+    for item_name in item_names:
+        if item_name not in inventory:
+            missing.append(item_name)
+            continue
+        del inventory[item_name]
+        succeeded += 1
+    
+    report["succeeded"] = succeeded
+    return report
+
+def print_batch_report(report):
+    """
+    Print a one-line summary of a batch operation.
+    
+    Args:
+        report (dict): Report returned by add_items, update_items or remove_items
+    """
+    status = "applied" if report["applied"] else "rolled back"
+    print(f"Batch {report['operation']} {status}: {report['succeeded']} succeeded, "
+          f"{len(report['conflicts'])} conflicts, {len(report['missing'])} missing.")
+
+BATCH_SYNTAX = """\
+Batch commands, one per line (blank lines and lines starting with # are skipped):
+  a NAME QUANTITY PRICE   add a new item
+  u NAME QUANTITY PRICE   update an item; use - to keep a value
+  r NAME                  remove an item
+  g NAME                  get an item's quantity and price
+  t                       total value of the inventory
+  d [LIMIT [OFFSET]]      list items as [name, quantity, price] rows
+Item names may contain spaces."""
+
+def _parse_batch_price(text):
+    """Parse a batch price, rejecting inf and nan, which JSON cannot carry."""
+    price = float(text)
+    if not math.isfinite(price):
+        raise ValueError(f"Price must be a finite number, not {text!r}")
+    return price
+
+def run_batch_command(inventory, line):
+    """
+    Execute one batch command against the inventory without printing.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        line (str): Command in the BATCH_SYNTAX format
+    
+    Returns:
+        The command's result: True for changes, a value for queries
+    
+    Raises:
+        ValueError: If the command is malformed or cannot be applied
+        OverflowError: If the inventory cannot store a value
+    """
+    op, _, rest = line.strip().partition(" ")
+    rest = rest.strip()
+    
+    if op in ("a", "u"):
+        fields = rest.rsplit(None, 2)
+        if len(fields) != 3:
+            raise ValueError(f"'{op}' needs NAME QUANTITY PRICE")
+        item_name, quantity, price = fields
+        if op == "a":
+            if item_name in inventory:
+                raise ValueError(f"{item_name} already exists in inventory")
+            inventory[item_name] = (int(quantity), _parse_batch_price(price))
+            return True
+        if item_name not in inventory:
+            raise ValueError(f"{item_name} not found in inventory")
+        current_quantity, current_price = inventory[item_name]
+        inventory[item_name] = (
+            current_quantity if quantity == "-" else int(quantity),
+            current_price if price == "-" else _parse_batch_price(price),
+        )
+        return True
+    
+    if op in ("r", "g"):
+        if not rest:
+            raise ValueError(f"'{op}' needs NAME")
+        if rest not in inventory:
+            raise ValueError(f"{rest} not found in inventory")
+        if op == "r":
+            del inventory[rest]
+            return True
+        quantity, price = inventory[rest]
+        return [quantity, price]
+    
+    if op == "t":
+        return calculate_total_value(inventory)
+    
+    if op == "d":
+        numbers = [int(number) for number in rest.split()]
+        if len(numbers) > 2:
+            raise ValueError("'d' takes at most LIMIT and OFFSET")
+        limit = numbers[0] if numbers else None
+        offset = numbers[1] if len(numbers) > 1 else 0
+        return [[item, quantity, price] for item, quantity, price, _ in
+                iter_inventory_rows(inventory, limit=limit, offset=offset)]
+    
+    raise ValueError(f"Unknown command {op!r}")
+
+def commit_changes(inventory):
+    """
+    Force buffered changes to disk if the inventory keeps them on disk.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+    """
+    commit = getattr(inventory, "commit", None)
+    if commit is not None:
+        commit()
+
+def run_batch(inventory, lines, out, errors_only=False):
+    """
+    Run batch commands and write one JSON result line per command.
+    
+    Each result looks like {"line": 3, "ok": true, "result": ...} or
+    {"line": 4, "ok": false, "error": "..."}. Processing continues after
+    a failed command. Changes are committed before their results are
+    written, so a reported change is never lost.
+    
+    Args:
+        inventory (dict): The inventory dictionary
+        lines (iterable): Command lines
+        out (file): Stream for the JSON result lines
+        errors_only (bool): Only write results for failed commands
+    
+    Returns:
+        dict: Counts of commands run and failed, and the elapsed seconds
+    """
+    start = time.perf_counter()
+    commands = 0
+    failures = 0
+    results = []
+    
+    for line_number, line in enumerate(lines, start=1):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        commands += 1
+        try:
+            result = {"line": line_number, "ok": True, "result": run_batch_command(inventory, stripped)}
+            encoded = None if errors_only else json.dumps(result, allow_nan=False)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            # Bad input and values the store rejects fail only this command
+            failures += 1
+            encoded = json.dumps({"line": line_number, "ok": False, "error": str(e)})
+        else:
+            if errors_only:
+                continue
+        results.append(encoded)
+        
+        # Write results in blocks rather than line by line
+        if len(results) >= 1000:
+            commit_changes(inventory)
+            out.write("\n".join(results) + "\n")
+            results = []
+    
+    commit_changes(inventory)
+    if results:
+        out.write("\n".join(results) + "\n")
+    return {"commands": commands, "failed": failures, "seconds": time.perf_counter() - start}
+
+def main(argv=None):
     """Main function to run the inventory management program."""
-    print("🛒 Welcome to the Inventory Manager! 🛒")
+    parser = argparse.ArgumentParser(
+        description="Inventory Manager",
+        epilog=BATCH_SYNTAX,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run commands from FILE (or - for standard input) instead of the menu")
+    parser.add_argument("--results", metavar="FILE",
+                        help="Write batch results to FILE instead of standard output")
+    parser.add_argument("--errors-only", action="store_true",
+                        help="Only report failed batch commands")
+    parser.add_argument("--data-dir", metavar="DIR",
+                        help="Load and save the inventory in DIR instead of starting empty")
+    args = parser.parse_args(argv)
     
-    # Start with an empty inventory
-    inventory = {}
+    if args.data_dir:
+        inventory = DurableInventory(args.data_dir)
+    else:
+        # Start with an empty inventory that keeps its total value up to date
+        inventory = IncrementalInventory()
     
-    # Add initial items
-    inventory = add_item(inventory, "apple", 10, 2.5)
-    inventory = add_item(inventory, "banana", 20, 1.2)
+    try:
+        if args.batch:
+            commands = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+            out = sys.stdout if not args.results else open(args.results, "w", encoding="utf-8")
+            try:
+                summary = run_batch(inventory, commands, out, args.errors_only)
+            finally:
+                if commands is not sys.stdin:
+                    commands.close()
+                if out is not sys.stdout:
+                    out.close()
+            print(json.dumps(summary), file=sys.stderr)
+        else:
+            # The demo edits sample items, so only run it on a fresh inventory
+            run_interactive(inventory, demo=not args.data_dir)
+    finally:
+        if args.data_dir:
+            inventory.close()
+
+def run_interactive(inventory, demo=True):
+    """
+    Run the demo and the interactive menu.
     
-    # Display initial inventory
-    display_inventory(inventory)
+    Args:
+        inventory (dict): The inventory dictionary
+        demo (bool): If True, first add, update and remove sample items.
+            Leave it off for a stored inventory, which the demo would change.
+    """
+    print("🛒 Welcome to the Inventory Manager! 🛒")
     
-    # Add a new item
-    print("\nAdding a new item: mango")
-    inventory = add_item(inventory, "mango", 15, 3.0)
+    if demo:
+        # Add initial items
+        inventory = add_item(inventory, "apple", 10, 2.5)
+        inventory = add_item(inventory, "banana", 20, 1.2)
     
-    # Display updated inventory
-    display_inventory(inventory)
+        # Display initial inventory
+        display_inventory(inventory)
     
-    # Update an item
-    print("\nUpdating quantity of apples to 15")
-    inventory = update_item(inventory, "apple", quantity=15)
+        # Add a new item
+        print("\nAdding a new item: mango")
+        inventory = add_item(inventory, "mango", 15, 3.0)
     
-    # Display updated inventory
-    display_inventory(inventory)
+        # Display updated inventory
+        display_inventory(inventory)
     
-    # Remove an item
-    print("\nRemoving bananas from inventory")
-    inventory = remove_item(inventory, "banana")
+        # Update an item
+        print("\nUpdating quantity of apples to 15")
+        inventory = update_item(inventory, "apple", quantity=15)
     
-    # Display updated inventory
-    display_inventory(inventory)
+        # Display updated inventory
+        display_inventory(inventory)
     
-    # Calculate and display total value
-    total_value = calculate_total_value(inventory)
-    print(f"\nTotal value of inventory: ${total_value:.2f}")
+        # Remove an item
+        print("\nRemoving bananas from inventory")
+        inventory = remove_item(inventory, "banana")
+    
+        # Display updated inventory
+        display_inventory(inventory)
+    
+        # Calculate and display total value
+        total_value = calculate_total_value(inventory)
+        print(f"\nTotal value of inventory: ${total_value:.2f}")
     
     print("\n--- Interactive Mode ---")
     print("Let's try some operations interactively!")
     
     while True:
+        # Save the last operation before waiting for input
+        commit_changes(inventory)
+        
         print("\nChoose an operation:")
         print("1. Display inventory")
         print("2. Add new item")
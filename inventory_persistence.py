@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Inventory Persistence
+This module keeps an inventory on disk using two files in a data directory:
+
+    inventory.log   an append-only write-ahead log of every change
+    inventory.snap  a compact binary snapshot of the whole inventory
+
+On startup the snapshot is memory-mapped and loaded column by column, then
+only the log records written after the snapshot are replayed.
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from array import array
+from collections.abc import MutableMapping
+
+from inventory_store import ColumnarInventory
+
+LOG_FILE = "inventory.log"
+SNAPSHOT_FILE = "inventory.snap"
+
+# Log record: crc32, sequence number, operation, quantity, price, name length
+LOG_RECORD = struct.Struct("<IQBqdH")
+# Longest item name in UTF-8 bytes that the name length field can hold
+MAX_NAME_BYTES = 0xFFFF
+OP_SET = 1
+OP_DELETE = 2
+
+# Snapshot header: magic, last sequence number, item count, name bytes
+SNAPSHOT_MAGIC = b"INVSNAP1"
+SNAPSHOT_HEADER = struct.Struct("<8sQQQ")
+
+
+def _encode_record(sequence, op, item_name, quantity, price):
+    """Encode one log record, including a checksum over everything after it."""
+    name_bytes = item_name.encode("utf-8")
+    body = LOG_RECORD.pack(0, sequence, op, quantity, price, len(name_bytes))[4:] + name_bytes
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def check_item_name(item_name):
+    """
+    Check that an item name can be stored in both the log and a snapshot.
+
+    Raises:
+        ValueError: If the name contains a NUL character, which separates
+            names in a snapshot, or is longer than MAX_NAME_BYTES in UTF-8
+    """
+    if "\0" in item_name:
+        raise ValueError("Item names cannot contain NUL characters")
+    if len(item_name) * 4 > MAX_NAME_BYTES and len(item_name.encode("utf-8")) > MAX_NAME_BYTES:
+        raise ValueError(f"Item names cannot be longer than {MAX_NAME_BYTES} UTF-8 bytes")
+
+
+def _scan_log(data):
+    """
+    Walk the intact records at the start of a log's contents.
+
+    Yields:
+        tuple: (end offset, (sequence, op, item_name, quantity, price))
+    """
+    offset = 0
+    header_size = LOG_RECORD.size
+    while offset + header_size <= len(data):
+        crc, sequence, op, quantity, price, name_length = LOG_RECORD.unpack_from(data, offset)
+        end = offset + header_size + name_length
+        if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+            return
+        item_name = data[offset + header_size:end].decode("utf-8")
+        yield end, (sequence, op, item_name, quantity, price)
+        offset = end
+
+
+def _read_log_data(path):
+    """Return the raw contents of a log file, or b"" if it does not exist."""
+    if not os.path.exists(path):
+        return b""
+    with open(path, "rb") as log_file:
+        return log_file.read()
+
+
+def read_log(path):
+    """
+    Read every intact record from a write-ahead log.
+
+    Reading stops at the first truncated or corrupted record, which is what a
+    crash in the middle of a write leaves behind.
+
+    Args:
+        path (str): Path to the log file
+
+    Yields:
+        tuple: (sequence, op, item_name, quantity, price)
+    """
+    for _, record in _scan_log(_read_log_data(path)):
+        yield record
+
+
+class InventoryLog:
+    """
+    Append-only write-ahead log with group commit.
+
+    Records are buffered in memory and written with a single write and fsync
+    once group_size records are pending, once the oldest pending record has
+    waited max_delay seconds, or whenever commit() is called. The delay is
+    only checked when a record is appended, so callers should commit() when
+    they stop making changes.
+    """
+
+    def __init__(self, path, next_sequence=1, group_size=1000, sync=True, max_delay=0.1):
+        """
+        Open a log for appending.
+
+        Args:
+            path (str): Path to the log file
+            next_sequence (int): Sequence number of the next record
+            group_size (int): Number of pending records that triggers a commit
+            sync (bool): If True, fsync the file on every commit
+            max_delay (float): Seconds a record may wait for its group to
+                fill, or None for no limit
+        """
+        self.path = path
+        self.next_sequence = next_sequence
+        self.group_size = group_size
+        self.sync = sync
+        self.max_delay = max_delay
+        self._pending = []
+        self._pending_since = 0.0
+        self._file = open(path, "ab")
+
+    def append(self, op, item_name, quantity=0, price=0.0):
+        """
+        Buffer one record and commit the group if it is full or has waited
+        too long.
+
+        Returns:
+            int: Sequence number assigned to the record
+        """
+        sequence = self.next_sequence
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append(_encode_record(sequence, op, item_name, quantity, price))
+        self.next_sequence += 1
+        if len(self._pending) >= self.group_size or (
+            self.max_delay is not None and time.monotonic() - self._pending_since >= self.max_delay
+        ):
+            self.commit()
+        return sequence
+
+    def commit(self):
+        """Write all pending records to disk in one batch."""
+        if not self._pending:
+            return
+        self._file.write(b"".join(self._pending))
+        self._file.flush()
+        if self.sync:
+            os.fsync(self._file.fileno())
+        self._pending.clear()
+
+    def truncate(self):
+        """Discard every record in the log, for use after a snapshot."""
+        self._pending.clear()
+        self._file.truncate(0)
+        self._file.seek(0)
+        if self.sync:
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        """Commit pending records and close the file."""
+        if self._file.closed:
+            return
+        self.commit()
+        self._file.close()
+
+
+def encode_snapshot(inventory, sequence=0):
+    """
+    Encode an inventory in the binary snapshot format.
+
+    The snapshot holds a header, the quantity column, the price column and
+    finally every name separated by NUL bytes.
+
+    Args:
+        inventory (dict): Inventory to encode
+        sequence (int): Last log sequence number included in the snapshot
+
+    Returns:
+        list: Byte strings that make up the snapshot when joined
+
+    Raises:
+        ValueError: If an item name contains a NUL character
+    """
+    if isinstance(inventory, ColumnarInventory):
+        names, quantities, prices = inventory.columns()
+    else:
+        names = list(inventory)
+        quantities = array("q", (quantity for quantity, _ in inventory.values()))
+        prices = array("d", (price for _, price in inventory.values()))
+
+    name_blob = "\0".join(names)
+    if name_blob.count("\0") != max(len(names) - 1, 0):
+        raise ValueError("Item names cannot contain NUL characters")
+    name_bytes = name_blob.encode("utf-8")
+
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, sequence, len(names), len(name_bytes))
+    return [header, quantities.tobytes(), prices.tobytes(), name_bytes]
+
+
+def write_snapshot(path, inventory, sequence=0):
+    """
+    Write an inventory to a binary snapshot file.
+
+    The snapshot is written to a temporary file first and moved into place,
+    so a crash never leaves half a snapshot.
+
+    Args:
+        path (str): Destination path
+        inventory (dict): Inventory to save
+        sequence (int): Last log sequence number included in the snapshot
+
+    Raises:
+        ValueError: If an item name contains a NUL character
+    """
+    parts = encode_snapshot(inventory, sequence)
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.writelines(parts)
+        snapshot_file.flush()
+        os.fsync(snapshot_file.fileno())
+    os.replace(temp_path, path)
+
+
+def snapshot_columns(buffer):
+    """
+    View the columns of a snapshot without copying them.
+
+    Args:
+        buffer: bytes, mmap, shared memory or memoryview holding a snapshot
+
+    Returns:
+        tuple: (sequence, count, quantities, prices, names) where quantities
+               and prices are memoryviews cast to "q" and "d" and names is a
+               memoryview of the NUL-separated UTF-8 name bytes
+
+    Raises:
+        ValueError: If the buffer is not a valid snapshot
+    """
+    view = memoryview(buffer)
+    if len(view) < SNAPSHOT_HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    magic, sequence, count, name_length = SNAPSHOT_HEADER.unpack_from(view)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not an inventory snapshot")
+
+    quantity_start = SNAPSHOT_HEADER.size
+    price_start = quantity_start + 8 * count
+    name_start = price_start + 8 * count
+    if len(view) < name_start + name_length:
+        raise ValueError("Snapshot is truncated")
+
+    quantities = view[quantity_start:price_start].cast("q")
+    prices = view[price_start:name_start].cast("d")
+    names = view[name_start:name_start + name_length]
+    return sequence, count, quantities, prices, names
+
+
+def read_snapshot_buffer(buffer):
+    """
+    Decode a snapshot held in any bytes-like buffer.
+
+    Args:
+        buffer: bytes, mmap or memoryview containing a snapshot
+
+    Returns:
+        tuple: (sequence, ColumnarInventory)
+
+    Raises:
+        ValueError: If the buffer is not a valid snapshot
+    """
+    sequence, count, quantity_view, price_view, name_view = snapshot_columns(buffer)
+
+    # Copy each column straight out of the buffer
+    quantities = array("q")
+    quantities.frombytes(quantity_view.cast("B"))
+    prices = array("d")
+    prices.frombytes(price_view.cast("B"))
+    names = str(name_view, "utf-8").split("\0") if count else []
+    for view in (quantity_view, price_view, name_view):
+        view.release()
+
+    # Names in a snapshot are unique, so the name index can wait until the
+    # first lookup. Opening only to iterate or total never pays for it, but
+    # replaying even one log record does, since replay looks names up
+    return sequence, ColumnarInventory.from_columns(names, quantities, prices, lazy_index=True)
+
+
+def load_snapshot(path):
+    """
+    Load a snapshot file by memory-mapping it.
+
+    Args:
+        path (str): Path to the snapshot
+
+    Returns:
+        tuple: (sequence, ColumnarInventory), or (0, empty inventory) if the
+               file does not exist
+    """
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return 0, ColumnarInventory()
+
+    with open(path, "rb") as snapshot_file:
+        with mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return read_snapshot_buffer(mapped)
+
+
+class DurableInventory(MutableMapping):
+    """
+    Inventory that survives restarts.
+
+    Changes are applied to an in-memory ColumnarInventory and recorded in the
+    write-ahead log. Every snapshot_every changes the whole inventory is
+    written to a new snapshot and the log is emptied.
+    """
+
+    def __init__(self, directory, group_size=1000, snapshot_every=1_000_000, sync=True, max_delay=0.1):
+        """
+        Open (or create) an inventory stored in a directory.
+
+        Args:
+            directory (str): Data directory holding the log and snapshot
+            group_size (int): Log records written per group commit
+            snapshot_every (int): Changes between automatic snapshots, or
+                None to only snapshot when checkpoint() is called
+            sync (bool): If True, fsync the log on every commit
+            max_delay (float): Seconds a change may wait in the log buffer
+                before the next change commits it, or None for no limit
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self._log_path = os.path.join(directory, LOG_FILE)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+
+        # Load the snapshot, then replay only the log records after it
+        sequence, self._inventory = load_snapshot(self._snapshot_path)
+        log_data = _read_log_data(self._log_path)
+        valid_length = 0
+        for valid_length, record in _scan_log(log_data):
+            record_sequence, op, item_name, quantity, price = record
+            if record_sequence <= sequence:
+                continue
+            if op == OP_SET:
+                self._inventory[item_name] = (quantity, price)
+            elif op == OP_DELETE:
+                self._inventory.pop(item_name, None)
+            sequence = record_sequence
+
+        # Cut off a torn tail so new records are not hidden behind it
+        if valid_length < len(log_data):
+            with open(self._log_path, "r+b") as log_file:
+                log_file.truncate(valid_length)
+
+        self._log = InventoryLog(self._log_path, sequence + 1, group_size, sync, max_delay)
+        self._changes_since_snapshot = 0
+
+    def __getitem__(self, item_name):
+        return self._inventory[item_name]
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details
+        # Reject names the log or a snapshot cannot hold before anything
+        # is changed, so a bad name never reaches disk
+        check_item_name(item_name)
+        self._inventory[item_name] = (quantity, price)
+        self._log.append(OP_SET, item_name, quantity, price)
+        self._record_change()
+
+    def __delitem__(self, item_name):
+        del self._inventory[item_name]
+        self._log.append(OP_DELETE, item_name)
+        self._record_change()
+
+    def __iter__(self):
+        return iter(self._inventory)
+
+    def __len__(self):
+        return len(self._inventory)
+
+    def __contains__(self, item_name):
+        return item_name in self._inventory
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.directory!r}, {len(self)} items)"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def items(self):
+        """Return (name, (quantity, price)) pairs."""
+        return self._inventory.items()
+
+    def total_value(self):
+        """Return the total value of the inventory."""
+        return self._inventory.total_value()
+
+    def _record_change(self):
+        """Count a change and take a snapshot when one is due."""
+        self._changes_since_snapshot += 1
+        if self.snapshot_every and self._changes_since_snapshot >= self.snapshot_every:
+            self.checkpoint()
+
+    def commit(self):
+        """Force every buffered change to disk."""
+        self._log.commit()
+
+    def checkpoint(self):
+        """Write a fresh snapshot and empty the log."""
+        self._log.commit()
+        write_snapshot(self._snapshot_path, self._inventory, self._log.next_sequence - 1)
+        self._log.truncate()
+        self._changes_since_snapshot = 0
+
+    def close(self):
+        """Commit buffered changes and close the log."""
+        self._log.close()
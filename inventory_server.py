@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Inventory Server
+This program serves the inventory over TCP so many clients can use it at
+once. The protocol is line-delimited JSON: each request is one JSON object
+on its own line, and each response is one JSON line sent back in the same
+order the requests arrived.
+
+Requests look like:
+    {"id": 1, "op": "add", "name": "apple", "quantity": 10, "price": 2.5}
+    {"id": 2, "op": "update", "name": "apple", "quantity": 15}
+    {"id": 3, "op": "remove", "name": "apple"}
+    {"id": 4, "op": "get", "name": "apple"}
+    {"id": 5, "op": "total"}
+    {"id": 6, "op": "display", "limit": 100}
+
+Clients may pipeline requests without waiting for responses. Requests from
+every connection are queued and applied together once per event loop turn,
+so a burst of concurrent writes is handled as one batch.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+
+from inventory_store import IncrementalInventory
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+class RequestError(Exception):
+    """Raised when a request is malformed or cannot be applied."""
+
+
+def _read_quantity(request, required):
+    """Validate the quantity field the way the interactive menu does."""
+    quantity = request.get("quantity")
+    if quantity is None and not required:
+        return None
+    if not isinstance(quantity, int) or isinstance(quantity, bool):
+        raise RequestError("Quantity must be an integer")
+    return quantity
+
+
+def _read_price(request, required):
+    """Validate the price field the way the interactive menu does."""
+    price = request.get("price")
+    if price is None and not required:
+        return None
+    if not isinstance(price, (int, float)) or isinstance(price, bool):
+        raise RequestError("Price must be a number")
+    try:
+        price = float(price)
+    except OverflowError:
+        raise RequestError("Price is too large") from None
+    if not math.isfinite(price):
+        raise RequestError("Price must be a finite number")
+    return price
+
+
+def _read_name(request):
+    """Return the item name from a request."""
+    item_name = request.get("name")
+    if not isinstance(item_name, str) or not item_name:
+        raise RequestError("Item name must be a non-empty string")
+    return item_name
+
+
+def apply_request(inventory, request):
+    """
+    Apply one decoded request to the inventory.
+
+    Args:
+        inventory (dict): The inventory dictionary
+        request (dict): Decoded request
+
+    Returns:
+        The result to send back to the client
+
+    Raises:
+        RequestError: If the request is invalid or cannot be applied
+    """
+    op = request.get("op")
+
+    if op == "add":
+        item_name = _read_name(request)
+        quantity = _read_quantity(request, required=True)
+        price = _read_price(request, required=True)
+        if item_name in inventory:
+            raise RequestError(f"{item_name} already exists in inventory")
+        inventory[item_name] = (quantity, price)
+        return True
+
+    if op == "update":
+        item_name = _read_name(request)
+        quantity = _read_quantity(request, required=False)
+        price = _read_price(request, required=False)
+        if item_name not in inventory:
+            raise RequestError(f"{item_name} not found in inventory")
+        current_quantity, current_price = inventory[item_name]
+        inventory[item_name] = (
+            quantity if quantity is not None else current_quantity,
+            price if price is not None else current_price,
+        )
+        return True
+
+    if op == "remove":
+        item_name = _read_name(request)
+        if item_name not in inventory:
+            raise RequestError(f"{item_name} not found in inventory")
+        del inventory[item_name]
+        return True
+
+    if op == "get":
+        item_name = _read_name(request)
+        if item_name not in inventory:
+            raise RequestError(f"{item_name} not found in inventory")
+        return list(inventory[item_name])
+
+    if op == "total":
+        return inventory.total_value()
+
+    if op == "display":
+        limit = request.get("limit", 100)
+        offset = request.get("offset", 0)
+        if not isinstance(limit, int) or not isinstance(offset, int) or limit < 0 or offset < 0:
+            raise RequestError("Limit and offset must be non-negative integers")
+        rows = []
+        for index, (item_name, (quantity, price)) in enumerate(inventory.items()):
+            if index >= offset + limit:
+                break
+            if index >= offset:
+                rows.append([item_name, quantity, price])
+        return rows
+
+    raise RequestError(f"Unknown operation {op!r}")
+
+
+class InventoryService:
+    """
+    Owns the inventory and applies queued requests in batches.
+
+    Every request is appended to one queue together with a future. The
+    first request after a flush schedules the next flush, so everything
+    that arrives during one event loop turn is applied in a single pass.
+    """
+
+    def __init__(self, inventory=None):
+        self.inventory = inventory if inventory is not None else IncrementalInventory()
+        self._pending = []
+        self._flush_scheduled = False
+        self.batches = 0
+        self.requests = 0
+
+    def submit(self, request):
+        """
+        Queue a request for the next batch.
+
+        Returns:
+            asyncio.Future: Resolves to the response dictionary
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            loop.call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        """Apply every queued request in arrival order."""
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+        self.batches += 1
+        self.requests += len(pending)
+
+        for request, future in pending:
+            response = {"id": request.get("id")}
+            try:
+                response["ok"] = True
+                response["result"] = apply_request(self.inventory, request)
+            except RequestError as e:
+                response["ok"] = False
+                response["error"] = str(e)
+            except Exception as e:
+                # A value the store rejects must not strand the rest of the batch
+                response["ok"] = False
+                response["error"] = f"Request failed: {type(e).__name__}: {e}"
+                response.pop("result", None)
+            if not future.cancelled():
+                future.set_result(response)
+
+    async def handle_client(self, reader, writer):
+        """Serve one connection until the client disconnects."""
+        responses = asyncio.Queue()
+
+        async def send_responses():
+            # Write responses in request order, flushing when the queue drains
+            while True:
+                future = await responses.get()
+                if future is None:
+                    break
+                writer.write(json.dumps(await future).encode("utf-8") + b"\n")
+                if responses.empty():
+                    await writer.drain()
+
+        sender = asyncio.create_task(send_responses())
+        try:
+            while True:
+                try:
+                    line = await reader.readuntil(b"\n")
+                except asyncio.IncompleteReadError as e:
+                    line = e.partial
+                except asyncio.LimitOverrunError:
+                    # Answer an oversized line with an error and keep serving
+                    # the requests pipelined behind it
+                    await _skip_line(reader)
+                    line = None
+                if line == b"":
+                    break
+                if line is not None and not line.strip():
+                    continue
+                try:
+                    if line is None:
+                        raise ValueError("Request line is too long")
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object")
+                except ValueError as e:
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_result({"id": None, "ok": False, "error": f"Invalid request: {e}"})
+                else:
+                    future = self.submit(request)
+                responses.put_nowait(future)
+        except ConnectionError:
+            pass
+        finally:
+            responses.put_nowait(None)
+            try:
+                await sender
+                await writer.drain()
+            except ConnectionError:
+                pass
+            writer.close()
+
+
+async def _skip_line(reader):
+    """Discard the rest of an oversized line, up to and including its newline."""
+    while True:
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.IncompleteReadError:
+            return
+        except asyncio.LimitOverrunError as e:
+            await reader.readexactly(e.consumed)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, inventory=None):
+    """
+    Start the inventory server and run until cancelled.
+
+    Args:
+        host (str): Interface to listen on
+        port (int): TCP port to listen on
+        inventory (dict, optional): Inventory to serve
+    """
+    service = InventoryService(inventory)
+    server = await asyncio.start_server(service.handle_client, host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Inventory server listening on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """Parse command-line options and run the server."""
+    parser = argparse.ArgumentParser(description="Serve the inventory over line-delimited JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nInventory server stopped.")
+
+
+if __name__ == "__main__":
+    main()
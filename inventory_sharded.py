@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Sharded Inventory
+This module runs chain-wide valuation and reporting over many warehouse
+inventories in parallel. Each warehouse (shard) is published once into a
+shared memory block using the snapshot format from inventory_persistence.py,
+and worker processes read the quantity and price columns straight out of
+that block. Only the block name crosses the process boundary, so the item
+data is never pickled. A shard is republished only after it changes.
+
+Run this file directly to benchmark serial and parallel valuation.
+"""
+
+import argparse
+import os
+import time
+from array import array
+from collections.abc import MutableMapping
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from operator import mul
+
+from inventory_manager import calculate_total_value
+from inventory_persistence import encode_snapshot, snapshot_columns
+from inventory_store import ColumnarInventory
+
+
+def _summarize_shard(block_name, low_stock_threshold):
+    """
+    Summarize one published shard inside a worker process.
+
+    Args:
+        block_name (str): Name of the shared memory block holding the shard
+        low_stock_threshold (int, optional): Report items with a quantity
+            below this; None skips the low-stock scan
+
+    Returns:
+        dict: Item count, total units, total value and low-stock items
+    """
+    block = shared_memory.SharedMemory(name=block_name)
+    try:
+        _, count, quantities, prices, names = snapshot_columns(block.buf)
+        try:
+            summary = {
+                "items": count,
+                "units": sum(quantities),
+                "value": sum(map(mul, quantities, prices)),
+                "low_stock": [],
+            }
+            if low_stock_threshold is not None:
+                low_rows = [row for row, quantity in enumerate(quantities) if quantity < low_stock_threshold]
+                if low_rows:
+                    # Decode names only when there is something to report
+                    all_names = str(names, "utf-8").split("\0")
+                    summary["low_stock"] = [(all_names[row], quantities[row]) for row in low_rows]
+        finally:
+            for view in (quantities, prices, names):
+                view.release()
+    finally:
+        block.close()
+    return summary
+
+
+def _copy_inventory(inventory):
+    """Copy an inventory into a new ColumnarInventory."""
+    if isinstance(inventory, ColumnarInventory):
+        names, quantities, prices = inventory.columns()
+        return ColumnarInventory.from_columns(list(names), array("q", quantities), array("d", prices))
+    return ColumnarInventory(inventory)
+
+
+class _TrackedShard(MutableMapping):
+    """A shard's inventory that marks the shard as changed on every write."""
+
+    def __init__(self, inventory, mark_changed):
+        self._inventory = inventory
+        self._mark_changed = mark_changed
+
+    def __getitem__(self, item_name):
+        return self._inventory[item_name]
+
+    def __setitem__(self, item_name, details):
+        self._mark_changed()
+        self._inventory[item_name] = details
+
+    def __delitem__(self, item_name):
+        self._mark_changed()
+        del self._inventory[item_name]
+
+    def __iter__(self):
+        return iter(self._inventory)
+
+    def __len__(self):
+        return len(self._inventory)
+
+    def __contains__(self, item_name):
+        return item_name in self._inventory
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self._inventory!r})"
+
+    def items(self):
+        return self._inventory.items()
+
+
+class ShardedInventory:
+    """
+    Facade over one inventory per warehouse with parallel reporting.
+
+    Each shard is a copy of the inventory it was added with, so later
+    changes to the original do not reach it. Change a shard through
+    partition(), add_item(), update_item() or remove_item(). Every write
+    marks the shard as changed, so it is republished before the next
+    parallel pass.
+    """
+
+    def __init__(self, partitions=None, workers=None):
+        """
+        Create a sharded inventory.
+
+        Args:
+            partitions (dict, optional): Shard name -> inventory mapping;
+                each inventory is copied
+            workers (int, optional): Worker processes; defaults to the CPU count
+        """
+        self._partitions = {}
+        self._blocks = {}
+        self._dirty = set()
+        self._pool = ProcessPoolExecutor(max_workers=workers)
+        for shard, inventory in (partitions or {}).items():
+            self.add_partition(shard, inventory)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return sum(len(inventory) for inventory in self._partitions.values())
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self._partitions)} shards, {len(self)} items)"
+
+    def shards(self):
+        """Return the shard names."""
+        return list(self._partitions)
+
+    def add_partition(self, shard, inventory=None):
+        """
+        Add a copy of a warehouse inventory as a new shard.
+
+        Raises:
+            ValueError: If the shard already exists
+        """
+        if shard in self._partitions:
+            raise ValueError(f"Shard {shard!r} already exists")
+        inventory = _copy_inventory(inventory) if inventory is not None else ColumnarInventory()
+        self._partitions[shard] = _TrackedShard(inventory, lambda: self._dirty.add(shard))
+        self._dirty.add(shard)
+
+    def partition(self, shard):
+        """
+        Return a shard's inventory for direct changes.
+
+        Writes through the returned mapping, even long after this call,
+        mark the shard as changed.
+        """
+        return self._partitions[shard]
+
+    def add_item(self, shard, item_name, quantity, price):
+        """
+        Add an item to one shard.
+
+        Returns:
+            bool: True if the item was added, False if it already exists
+        """
+        inventory = self.partition(shard)
+        if item_name in inventory:
+            return False
+        inventory[item_name] = (quantity, price)
+        return True
+
+    def update_item(self, shard, item_name, quantity=None, price=None):
+        """
+        Update quantity or price of an item in one shard.
+
+        Returns:
+            bool: True if the item was updated, False if it was not found
+        """
+        inventory = self.partition(shard)
+        if item_name not in inventory:
+            return False
+        current_quantity, current_price = inventory[item_name]
+        inventory[item_name] = (
+            quantity if quantity is not None else current_quantity,
+            price if price is not None else current_price,
+        )
+        return True
+
+    def remove_item(self, shard, item_name):
+        """
+        Remove an item from one shard.
+
+        Returns:
+            bool: True if the item was removed, False if it was not found
+        """
+        inventory = self.partition(shard)
+        if item_name not in inventory:
+            return False
+        del inventory[item_name]
+        return True
+
+    def _publish(self):
+        """Copy every changed shard into a fresh shared memory block."""
+        for shard in self._dirty:
+            parts = encode_snapshot(self._partitions[shard]._inventory)
+            size = sum(len(part) for part in parts)
+            block = shared_memory.SharedMemory(create=True, size=size)
+            offset = 0
+            for part in parts:
+                block.buf[offset:offset + len(part)] = part
+                offset += len(part)
+
+            old_block = self._blocks.pop(shard, None)
+            if old_block is not None:
+                old_block.close()
+                old_block.unlink()
+            self._blocks[shard] = block
+        self._dirty.clear()
+
+    def summarize(self, low_stock_threshold=None):
+        """
+        Summarize every shard in parallel.
+
+        Returns:
+            dict: Shard name -> summary from _summarize_shard
+        """
+        self._publish()
+        futures = {
+            shard: self._pool.submit(_summarize_shard, block.name, low_stock_threshold)
+            for shard, block in self._blocks.items()
+        }
+        return {shard: future.result() for shard, future in futures.items()}
+
+    def total_value(self):
+        """Return the chain-wide total value."""
+        return sum(summary["value"] for summary in self.summarize().values())
+
+    def low_stock(self, threshold=5):
+        """
+        Find items below a quantity threshold in every warehouse.
+
+        Returns:
+            list: (shard, item_name, quantity) tuples, lowest quantity first
+        """
+        rows = [
+            (shard, item_name, quantity)
+            for shard, summary in self.summarize(threshold).items()
+            for item_name, quantity in summary["low_stock"]
+        ]
+        rows.sort(key=lambda row: (row[2], row[0], row[1]))
+        return rows
+
+    def report(self, low_stock_threshold=5):
+        """
+        Build a chain-wide report merged from every shard.
+
+        Returns:
+            dict: Totals across the chain plus a per-shard breakdown
+        """
+        summaries = self.summarize(low_stock_threshold)
+        return {
+            "shards": {
+                shard: {
+                    "items": summary["items"],
+                    "units": summary["units"],
+                    "value": summary["value"],
+                    "low_stock_items": len(summary["low_stock"]),
+                }
+                for shard, summary in summaries.items()
+            },
+            "items": sum(summary["items"] for summary in summaries.values()),
+            "units": sum(summary["units"] for summary in summaries.values()),
+            "value": sum(summary["value"] for summary in summaries.values()),
+            "low_stock_items": sum(len(summary["low_stock"]) for summary in summaries.values()),
+        }
+
+    def close(self):
+        """Stop the worker processes and free the shared memory blocks."""
+        self._pool.shutdown()
+        for block in self._blocks.values():
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+        self._dirty.update(self._partitions)
+
+
+def main():
+    """Compare serial and parallel chain-wide valuation."""
+    parser = argparse.ArgumentParser(description="Benchmark sharded inventory valuation")
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--items", type=int, default=500_000, help="Items per shard")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    partitions = {}
+    for shard in range(args.shards):
+        inventory = ColumnarInventory()
+        for i in range(args.items):
+            inventory[f"w{shard}-sku{i}"] = (i % 50, 1.0 + i % 7)
+        partitions[f"warehouse{shard}"] = inventory
+
+    start = time.perf_counter()
+    serial_total = sum(calculate_total_value(inventory) for inventory in partitions.values())
+    serial = time.perf_counter() - start
+    print(f"serial       {serial:8.3f}s  total ${serial_total:,.2f}")
+
+    for workers in args.workers:
+        with ShardedInventory(partitions, workers) as sharded:
+            sharded.total_value()  # publish shards and start the workers
+            start = time.perf_counter()
+            total = sharded.total_value()
+            elapsed = time.perf_counter() - start
+        print(f"{workers:2d} workers   {elapsed:8.3f}s  total ${total:,.2f}  speedup {serial / elapsed:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Inventory Storage Engines
+This module provides alternative storage for the inventory used by
+inventory_manager.py. Each store behaves like the inventory dictionary
+(item name -> (quantity, price)), so the functions in inventory_manager.py
+work on it unchanged.
+"""
+
+import math
+from array import array
+from collections.abc import ItemsView, MutableMapping
+from decimal import ROUND_HALF_UP, Decimal
+from functools import cached_property
+from operator import mul
+
+
+class _ColumnItemsView(ItemsView):
+    """Items view that reads (name, (quantity, price)) pairs straight from the columns."""
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class ColumnarInventory(MutableMapping):
+    """
+    Inventory that keeps quantities and prices in contiguous typed columns.
+
+    Quantities are stored in a signed 64-bit integer array and prices in a
+    double array, with a dictionary mapping each item name to its row.
+    Removing an item moves the last row into the freed slot, so the columns
+    never contain holes.
+    """
+
+    def __init__(self, items=None):
+        """
+        Create a columnar inventory.
+
+        Args:
+            items (dict or iterable, optional): Initial items, either a
+                mapping of name -> (quantity, price) or an iterable of
+                (name, quantity, price) records.
+        """
+        self._names = []
+        self._quantities = array("q")
+        self._prices = array("d")
+
+        if items is None:
+            return
+        if hasattr(items, "items"):
+            items = ((name, quantity, price) for name, (quantity, price) in items.items())
+        for item_name, quantity, price in items:
+            self[item_name] = (quantity, price)
+
+    @classmethod
+    def from_columns(cls, names, quantities, prices, lazy_index=False):
+        """
+        Build an inventory directly from prepared columns.
+
+        Args:
+            names (list): Item names, one per row, with no duplicates
+            quantities (array): Quantity column with typecode "q"
+            prices (array): Price column with typecode "d"
+            lazy_index (bool): If True, build the name -> row index on the
+                first lookup by name instead of now, without checking that
+                the names are unique. Iterating, totalling and exporting
+                never need the index; any lookup, set or delete builds it.
+
+        Returns:
+            ColumnarInventory: Inventory that takes ownership of the columns
+
+        Raises:
+            ValueError: If the columns differ in length or names repeat
+        """
+        if not len(names) == len(quantities) == len(prices):
+            raise ValueError("All columns must have the same length")
+
+        inventory = cls()
+        inventory._names = names
+        inventory._quantities = quantities
+        inventory._prices = prices
+        if lazy_index:
+            return inventory
+        if len(inventory._rows) != len(names):
+            raise ValueError("Item names must be unique")
+        return inventory
+
+    @cached_property
+    def _rows(self):
+        """Map each item name to its row, built from the names on first use."""
+        return dict(zip(self._names, range(len(self._names))))
+
+    def __getitem__(self, item_name):
+        row = self._rows[item_name]
+        return (self._quantities[row], self._prices[row])
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details
+        row = self._rows.get(item_name)
+
+        # Update the existing row in place, restoring it if a column rejects the value
+        if row is not None:
+            old_quantity = self._quantities[row]
+            try:
+                self._quantities[row] = quantity
+                self._prices[row] = price
+            except (TypeError, OverflowError):
+                self._quantities[row] = old_quantity
+                raise
+            return
+
+        # Append to the typed columns first; they reject values that do not
+        # fit, and the name is only registered once both appends succeed
+        self._quantities.append(quantity)
+        try:
+            self._prices.append(price)
+        except (TypeError, OverflowError):
+            self._quantities.pop()
+            raise
+        self._rows[item_name] = len(self._names)
+        self._names.append(item_name)
+
+    def __delitem__(self, item_name):
+        row = self._rows.pop(item_name)
+        last = len(self._names) - 1
+
+        # Fill the hole with the last row, then drop the last row
+        if row != last:
+            moved_name = self._names[last]
+            self._names[row] = moved_name
+            self._quantities[row] = self._quantities[last]
+            self._prices[row] = self._prices[last]
+            self._rows[moved_name] = row
+
+        self._names.pop()
+        self._quantities.pop()
+        self._prices.pop()
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, item_name):
+        return item_name in self._rows
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} items)"
+
+    def items(self):
+        """Return a view of (name, (quantity, price)) pairs in row order."""
+        return _ColumnItemsView(self)
+
+    def _iter_items(self):
+        return zip(self._names, zip(self._quantities, self._prices))
+
+    def add_item(self, item_name, quantity, price):
+        """
+        Add a new item to the inventory.
+
+        Returns:
+            bool: True if the item was added, False if it already exists
+        """
+        if item_name in self._rows:
+            return False
+        self[item_name] = (quantity, price)
+        return True
+
+    def remove_item(self, item_name):
+        """
+        Remove an item from the inventory.
+
+        Returns:
+            bool: True if the item was removed, False if it was not found
+        """
+        if item_name not in self._rows:
+            return False
+        del self[item_name]
+        return True
+
+    def update_item(self, item_name, quantity=None, price=None):
+        """
+        Update quantity or price of an existing item.
+
+        Returns:
+            bool: True if the item was updated, False if it was not found
+        """
+        row = self._rows.get(item_name)
+        if row is None:
+            return False
+        # Go through __setitem__ so a rejected value leaves the row unchanged
+        self[item_name] = (
+            self._quantities[row] if quantity is None else quantity,
+            self._prices[row] if price is None else price,
+        )
+        return True
+
+    def total_value(self):
+        """
+        Calculate the total value of all items.
+
+        Returns:
+            float: Sum of quantity * price over every row
+        """
+        # One pass over both columns without building a tuple per item
+        return sum(map(mul, self._quantities, self._prices))
+
+    def columns(self):
+        """
+        Return the raw storage columns.
+
+        Returns:
+            tuple: (names list, quantities array, prices array)
+        """
+        return self._names, self._quantities, self._prices
+
+
+# Every finite float is a whole multiple of 2**-1074, the smallest subnormal
+_UNIT_BITS = 1074
+_UNITS_PER_ONE = 1 << _UNIT_BITS
+
+
+def _exact_units(value):
+    """
+    Return a value as an exact whole number of 2**-1074 units.
+
+    Raises:
+        ValueError: If the value is inf or nan
+    """
+    try:
+        numerator, denominator = value.as_integer_ratio()
+    except (OverflowError, ValueError):
+        raise ValueError(f"Item value must be finite, not {value!r}") from None
+    if denominator & (denominator - 1):
+        # Not a binary fraction (e.g. a Decimal), so round it to a float first
+        return _exact_units(float(value))
+    return numerator << (_UNIT_BITS + 1 - denominator.bit_length())
+
+
+class IncrementalInventory(MutableMapping):
+    """
+    Inventory that keeps its valuation up to date as items change.
+
+    Every add, update and remove adjusts a running total value, a running
+    total quantity and the stored value of the affected item, so asking for
+    the total value never has to walk the inventory.
+
+    The running value is kept as an exact integer count of the smallest
+    float (2**-1074), so removing an item takes back exactly what adding
+    it put in and the total always equals a fresh math.fsum() of the
+    item values. Item values must therefore be finite.
+    """
+
+    def __init__(self, items=None, verify=False):
+        """
+        Create an incrementally valued inventory.
+
+        Args:
+            items (dict, optional): Initial items as name -> (quantity, price)
+            verify (bool): If True, every call to total_value() also checks
+                the running total against a full recompute
+        """
+        self._items = {}
+        self._values = {}
+        self._total_units = 0
+        self._total_quantity = 0
+        self.verify = verify
+
+        if items is not None:
+            for item_name, details in items.items():
+                self[item_name] = details
+
+    def __getitem__(self, item_name):
+        return self._items[item_name]
+
+    def __setitem__(self, item_name, details):
+        quantity, price = details
+        value = quantity * price
+        units = _exact_units(value)
+
+        # Back out the old contribution before adding the new one
+        old_details = self._items.get(item_name)
+        if old_details is not None:
+            self._total_units -= _exact_units(self._values[item_name])
+            self._total_quantity -= old_details[0]
+
+        self._items[item_name] = (quantity, price)
+        self._values[item_name] = value
+        self._total_units += units
+        self._total_quantity += quantity
+
+    def __delitem__(self, item_name):
+        quantity, _ = self._items.pop(item_name)
+        self._total_units -= _exact_units(self._values.pop(item_name))
+        self._total_quantity -= quantity
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_name):
+        return item_name in self._items
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} items)"
+
+    def items(self):
+        """Return (name, (quantity, price)) pairs in insertion order."""
+        return self._items.items()
+
+    def total_value(self):
+        """
+        Return the running total value of the inventory.
+
+        Returns:
+            float: Total value of inventory
+
+        Raises:
+            RuntimeError: If verify mode is on and the running total has
+                drifted from a full recompute
+        """
+        if self.verify:
+            self.verify_total()
+        return self._total_units / _UNITS_PER_ONE
+
+    def total_quantity(self):
+        """Return the running total number of units across all items."""
+        return self._total_quantity
+
+    def item_value(self, item_name):
+        """
+        Return the stored value (quantity * price) of one item.
+
+        Raises:
+            KeyError: If the item is not in the inventory
+        """
+        return self._values[item_name]
+
+    def recompute_total(self):
+        """
+        Recalculate the total value from scratch.
+
+        Returns:
+            float: Total value computed by walking every item
+        """
+        return math.fsum(quantity * price for quantity, price in self._items.values())
+
+    def verify_total(self, rel_tol=1e-9, abs_tol=1e-6):
+        """
+        Check the running total against a full recompute.
+
+        Args:
+            rel_tol (float): Allowed relative difference
+            abs_tol (float): Allowed absolute difference
+
+        Returns:
+            float: The recomputed total
+
+        Raises:
+            RuntimeError: If the two totals differ by more than the tolerance
+        """
+        expected = self.recompute_total()
+        running = self._total_units / _UNITS_PER_ONE
+        if not math.isclose(running, expected, rel_tol=rel_tol, abs_tol=abs_tol):
+            raise RuntimeError(
+                f"Running total {running!r} drifted from recomputed total {expected!r}"
+            )
+        return expected
+
+    def resync(self):
+        """Replace the running totals with freshly recomputed values."""
+        self._total_units = sum(map(_exact_units, self._values.values()))
+        self._total_quantity = sum(quantity for quantity, _ in self._items.values())
+
+
+def to_cents(price):
+    """
+    Convert a price to a whole number of cents.
+
+    Floats are converted through their shortest decimal form, so 2.675
+    becomes 268 cents rather than 267. Half a cent rounds up.
+
+    Args:
+        price (int, float, str or Decimal): Price in dollars
+
+    Returns:
+        int: Price in cents
+    """
+    if isinstance(price, int):
+        return price * 100
+    if isinstance(price, float):
+        price = repr(price)
+    return int((Decimal(price) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+class ItemRecord:
+    """
+    Small (quantity, price) record with the price held in integer cents.
+
+    A record unpacks and indexes like the (quantity, price) tuple used
+    everywhere else, so code written for tuples keeps working.
+    """
+
+    __slots__ = ("quantity", "price_cents")
+
+    def __init__(self, quantity, price_cents):
+        self.quantity = quantity
+        self.price_cents = price_cents
+
+    @classmethod
+    def from_price(cls, quantity, price):
+        """Create a record from a price in dollars."""
+        return cls(quantity, to_cents(price))
+
+    @property
+    def price(self):
+        """Price per unit in dollars."""
+        return self.price_cents / 100
+
+    @property
+    def value_cents(self):
+        """Exact value of the item (quantity * price) in cents."""
+        return self.quantity * self.price_cents
+
+    def __iter__(self):
+        yield self.quantity
+        yield self.price_cents / 100
+
+    def __len__(self):
+        return 2
+
+    def __getitem__(self, index):
+        return (self.quantity, self.price_cents / 100)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, ItemRecord):
+            return self.quantity == other.quantity and self.price_cents == other.price_cents
+        if isinstance(other, tuple):
+            return (self.quantity, self.price_cents / 100) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ItemRecord(quantity={self.quantity}, price={self.price_cents / 100:.2f})"
+
+
+class CompactInventory(MutableMapping):
+    """
+    Inventory that stores quantities and prices as integer columns.
+
+    Prices are kept in whole cents next to the quantities, so there are no
+    per-item tuple or float objects at all. Reading an item returns an
+    ItemRecord, which unpacks like a (quantity, price) tuple, and assigning a
+    (quantity, price) tuple converts the price to cents, so the functions in
+    inventory_manager.py work unchanged. The total value is kept as a running
+    integer number of cents, so it is exact and never drifts.
+    """
+
+    def __init__(self, items=None):
+        """
+        Create a compact inventory.
+
+        Args:
+            items (dict, optional): Initial items as name -> (quantity, price)
+        """
+        self._names = []
+        self._rows = {}
+        self._quantities = array("q")
+        self._cents = array("q")
+        self._total_cents = 0
+
+        if items is not None:
+            for item_name, details in items.items():
+                self[item_name] = details
+
+    def __getitem__(self, item_name):
+        row = self._rows[item_name]
+        return ItemRecord(self._quantities[row], self._cents[row])
+
+    def __setitem__(self, item_name, details):
+        if isinstance(details, ItemRecord):
+            quantity, price_cents = details.quantity, details.price_cents
+        else:
+            quantity, price = details
+            price_cents = to_cents(price)
+
+        # Check both values fit the 64-bit columns before touching anything,
+        # so a rejected value leaves the rows and the total unchanged
+        array("q", (quantity, price_cents))
+
+        row = self._rows.get(item_name)
+        if row is not None:
+            old_value = self._quantities[row] * self._cents[row]
+            self._quantities[row] = quantity
+            self._cents[row] = price_cents
+            self._total_cents += quantity * price_cents - old_value
+        else:
+            self._quantities.append(quantity)
+            self._cents.append(price_cents)
+            self._rows[item_name] = len(self._names)
+            self._names.append(item_name)
+            self._total_cents += quantity * price_cents
+
+    def __delitem__(self, item_name):
+        row = self._rows.pop(item_name)
+        last = len(self._names) - 1
+        self._total_cents -= self._quantities[row] * self._cents[row]
+
+        # Fill the hole with the last row, then drop the last row
+        if row != last:
+            moved_name = self._names[last]
+            self._names[row] = moved_name
+            self._quantities[row] = self._quantities[last]
+            self._cents[row] = self._cents[last]
+            self._rows[moved_name] = row
+
+        self._names.pop()
+        self._quantities.pop()
+        self._cents.pop()
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __contains__(self, item_name):
+        return item_name in self._rows
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} items)"
+
+    def items(self):
+        """Return a view of (name, ItemRecord) pairs in row order."""
+        return _ColumnItemsView(self)
+
+    def _iter_items(self):
+        return zip(self._names, map(ItemRecord, self._quantities, self._cents))
+
+    def total_cents(self):
+        """Return the exact total value of the inventory in cents."""
+        return self._total_cents
+
+    def total_value(self):
+        """
+        Return the total value of the inventory in dollars.
+
+        Returns:
+            float: Exact cent total converted to dollars
+        """
+        return self._total_cents / 100
+
+    def recompute_total_cents(self):
+        """Recalculate the cent total from the columns, for checking."""
+        return sum(map(mul, self._quantities, self._cents))
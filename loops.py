@@ -1,3 +1,5 @@
+from fast_math import factorial
+
 #counting down with loops
 start_num = int(input("What is your starting number?"))
 while start_num != 0:
@@ -12,9 +14,6 @@ for i in range(1, 11):
     
 #find factorial
 num = int(input("Enter a number: "))
-factorial = 1
-for i in range(1, num + 1):
-    factorial = factorial * i
-print("The factorial of", num, "is", factorial)
+print("The factorial of", num, "is", factorial(num))
 
 
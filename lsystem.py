@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Streaming L-System Generator
+This module describes fractals as L-systems: a starting string (the axiom)
+and rewriting rules applied again and again. Instead of building the
+rewritten string, the generators here walk the rules with a stack of
+iterators, so memory grows with the number of iterations rather than with
+the millions of segments the fractal may contain.
+
+Drawing uses turtle conventions: headings are in degrees with 0 pointing
+east, positive turns are to the left, "[" saves the position and heading
+and "]" restores them.
+"""
+
+import argparse
+import math
+import time
+from array import array
+
+import fractal_geometry
+
+# Number of segments collected into one array by segment_chunks()
+CHUNK_SEGMENTS = 8192
+
+
+class LSystem:
+    """
+    An L-system with the turtle settings needed to draw it.
+
+    A symbol produced after d rewrites is drawn with length
+    length * scale**d, so every expansion shrinks its pieces by scale.
+    """
+
+    def __init__(self, axiom, rules, angles, length=100, scale=1.0, origin=(0, 0),
+                 heading=0, draw_symbols="F", move_symbols=""):
+        """
+        Describe an L-system.
+
+        Args:
+            axiom (str): Starting symbols
+            rules (dict): Maps a symbol to the string that replaces it
+            angles (dict): Maps a symbol to a turn in degrees, left positive
+            length (float): Length of a segment drawn from the axiom
+            scale (float): Length factor applied for every rewrite
+            origin (tuple): (x, y) where drawing starts
+            heading (float): Starting direction in degrees
+            draw_symbols (str): Symbols that move forward drawing a line
+            move_symbols (str): Symbols that move forward without drawing
+        """
+        self.axiom = axiom
+        self.rules = dict(rules)
+        self.angles = dict(angles)
+        self.length = length
+        self.scale = scale
+        self.origin = origin
+        self.heading = heading
+        self.draw_symbols = frozenset(draw_symbols)
+        self.move_symbols = frozenset(move_symbols)
+
+    def __repr__(self):
+        return (f"{type(self).__name__}(axiom={self.axiom!r}, rules={self.rules!r}, "
+                f"angles={self.angles!r})")
+
+    def symbols(self, iterations):
+        """
+        Yield the fully rewritten symbols one at a time.
+
+        Args:
+            iterations (int): Number of times the rules are applied
+
+        Yields:
+            tuple: (symbol, depth) where depth is the number of rewrites
+                that produced the symbol
+        """
+        rules = self.rules
+        stack = [(iter(self.axiom), 0)]
+        while stack:
+            symbols, depth = stack[-1]
+            for symbol in symbols:
+                if depth < iterations and symbol in rules:
+                    stack.append((iter(rules[symbol]), depth + 1))
+                    break
+                yield symbol, depth
+            else:
+                stack.pop()
+
+    def segments(self, iterations):
+        """
+        Yield the line segments of the drawing one at a time.
+
+        Args:
+            iterations (int): Number of times the rules are applied
+
+        Yields:
+            tuple: (x0, y0, x1, y1) for each drawn segment
+        """
+        lengths = [self.length * self.scale ** depth for depth in range(iterations + 1)]
+        angles = self.angles
+        draw_symbols = self.draw_symbols
+        move_symbols = self.move_symbols
+        x, y = self.origin
+        heading = self.heading
+        cos_heading = math.cos(math.radians(heading))
+        sin_heading = math.sin(math.radians(heading))
+        saved = []
+
+        for symbol, depth in self.symbols(iterations):
+            if symbol in draw_symbols or symbol in move_symbols:
+                end_x = x + lengths[depth] * cos_heading
+                end_y = y + lengths[depth] * sin_heading
+                if symbol in draw_symbols:
+                    yield x, y, end_x, end_y
+                x, y = end_x, end_y
+            elif symbol in angles:
+                heading += angles[symbol]
+                cos_heading = math.cos(math.radians(heading))
+                sin_heading = math.sin(math.radians(heading))
+            elif symbol == "[":
+                saved.append((x, y, heading, cos_heading, sin_heading))
+            elif symbol == "]":
+                x, y, heading, cos_heading, sin_heading = saved.pop()
+
+
+# The Koch snowflake from draw_fractal_menu: three Koch curves with a
+# right turn of 120 degrees after each side. Use iterations = level.
+KOCH_SNOWFLAKE = LSystem(
+    axiom="F--F--F--",
+    rules={"F": "F+F--F+F"},
+    angles={"+": 60, "-": -60},
+    length=400,
+    scale=1 / 3,
+    origin=(-200, 0),
+)
+
+# The fractal tree from fractal_geometry.tree_segments: each branch splits
+# into one turned right by 20 degrees and one turned left by 40 degrees,
+# each 0.75 times as long. A marks a branch tip that has not grown yet and
+# is never drawn. Use iterations = level - 1.
+FRACTAL_TREE = LSystem(
+    axiom="F[-A][+A]",
+    rules={"A": "F[-A][+A]"},
+    angles={"+": 40, "-": -20},
+    length=100,
+    scale=0.75,
+    origin=(0, -250),
+    heading=90,
+)
+
+# Sierpinski triangle drawn as a single path. Use iterations = level.
+SIERPINSKI_TRIANGLE = LSystem(
+    axiom="F-G-G",
+    rules={"F": "F-G+F+G-F", "G": "GG"},
+    angles={"+": 120, "-": -120},
+    length=500,
+    scale=0.5,
+    origin=(-250, -200),
+    heading=60,
+    draw_symbols="FG",
+)
+
+PRESETS = {
+    "snowflake": (KOCH_SNOWFLAKE, 0),
+    "tree": (FRACTAL_TREE, -1),
+    "sierpinski": (SIERPINSKI_TRIANGLE, 0),
+}
+
+
+def preset_segments(name, level):
+    """
+    Stream the segments of a named preset at a menu-style level.
+
+    Args:
+        name (str): "snowflake", "tree" or "sierpinski"
+        level (int): Recursion level as used by draw_fractal_menu
+
+    Returns:
+        iterator: (x0, y0, x1, y1) tuples, none at all for a level below
+            the preset's first one (e.g. tree level 0)
+    """
+    lsystem, offset = PRESETS[name]
+    if level + offset < 0:
+        return iter(())
+    return lsystem.segments(level + offset)
+
+
+def segment_chunks(segments, size=CHUNK_SEGMENTS):
+    """
+    Group streamed segments into flat arrays of at most size segments.
+
+    The arrays use the same layout as fractal_geometry, so each chunk can be
+    passed to fractal_geometry.rasterize() or written out before the next
+    one is built.
+
+    Args:
+        segments (iterable): (x0, y0, x1, y1) tuples
+        size (int): Maximum number of segments per chunk
+
+    Yields:
+        array: Flat x0, y0, x1, y1 coordinates
+    """
+    chunk = array("d")
+    limit = size * 4
+    for segment in segments:
+        chunk.extend(segment)
+        if len(chunk) >= limit:
+            yield chunk
+            chunk = array("d")
+    if chunk:
+        yield chunk
+
+
+def stream_binary(segments, path):
+    """
+    Write segments to a file of native float64 x0, y0, x1, y1 values.
+
+    Returns:
+        int: Number of segments written
+    """
+    count = 0
+    with open(path, "wb") as output:
+        for chunk in segment_chunks(segments):
+            chunk.tofile(output)
+            count += len(chunk) // 4
+    return count
+
+
+def stream_svg(segments, path, width=fractal_geometry.CANVAS_WIDTH,
+               height=fractal_geometry.CANVAS_HEIGHT, stroke="blue", stroke_width=1):
+    """
+    Write segments to an SVG file one chunk at a time.
+
+    Returns:
+        int: Number of segments written
+    """
+    half_width = width / 2
+    half_height = height / 2
+    count = 0
+    with open(path, "w", encoding="utf-8") as output:
+        output.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+            f'viewBox="0 0 {width} {height}">\n'
+            '<rect width="100%" height="100%" fill="white"/>\n'
+            f'<path fill="none" stroke="{stroke}" stroke-width="{stroke_width}" d="'
+        )
+        for chunk in segment_chunks(segments):
+            output.write("".join(
+                f"M{chunk[i] + half_width:.2f} {half_height - chunk[i + 1]:.2f}"
+                f"L{chunk[i + 2] + half_width:.2f} {half_height - chunk[i + 3]:.2f}"
+                for i in range(0, len(chunk), 4)
+            ))
+            count += len(chunk) // 4
+        output.write('"/>\n</svg>\n')
+    return count
+
+
+def stream_png(segments, path, width=fractal_geometry.CANVAS_WIDTH,
+               height=fractal_geometry.CANVAS_HEIGHT, stroke="blue"):
+    """
+    Rasterize segments chunk by chunk and write a PNG file.
+
+    Returns:
+        int: Number of segments drawn
+    """
+    mask = bytearray(width * height)
+    count = 0
+    for chunk in segment_chunks(segments):
+        fractal_geometry.rasterize(chunk, width, height, mask)
+        count += len(chunk) // 4
+    with open(path, "wb") as output:
+        output.write(fractal_geometry.png_bytes(mask, width, height, stroke))
+    return count
+
+
+def main():
+    """Stream a preset L-system to an .svg, .png or raw .bin file."""
+    parser = argparse.ArgumentParser(description="Stream L-system fractals to a file")
+    parser.add_argument("fractal", choices=sorted(PRESETS))
+    parser.add_argument("level", type=int)
+    parser.add_argument("output", help="Output file ending in .svg, .png or .bin")
+    args = parser.parse_args()
+
+    writers = {".svg": stream_svg, ".png": stream_png, ".bin": stream_binary}
+    extension = args.output[args.output.rfind("."):].lower()
+    if extension not in writers:
+        parser.error("output must end in .svg, .png or .bin")
+
+    start = time.perf_counter()
+    count = writers[extension](preset_segments(args.fractal, args.level), args.output)
+    print(f"Streamed {count:,} segments to {args.output} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
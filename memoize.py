@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Memoization
+This module provides caching decorators for expensive functions such as
+the factorial and Fibonacci helpers. Like functools.lru_cache they remember
+results by argument, but they can also evict the least frequently used
+results, bound the cache by the memory its values take, save the cache to
+disk between runs, and report hits, misses and evictions.
+"""
+
+import atexit
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from functools import update_wrapper
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize", "currbytes"])
+CacheInfo.__doc__ = """
+Statistics for a memoized function.
+
+currbytes is the total size of the cached values as measured by the
+cache's sizeof function.
+"""
+
+LRU = "lru"
+LFU = "lfu"
+
+_KWARGS_MARK = object()
+
+
+def make_key(args, kwargs, typed=False):
+    """
+    Build a hashable cache key from call arguments.
+
+    Args:
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+        typed (bool): Keep arguments of different types apart, e.g. 3 and 3.0
+
+    Returns:
+        tuple: The key
+    """
+    key = args
+    if kwargs:
+        key += (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(value) for value in args)
+        if kwargs:
+            key += tuple(type(value) for _, value in sorted(kwargs.items()))
+    return key
+
+
+class LRUStore:
+    """Cache entries ordered from least to most recently used."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return (value, size) and mark the entry as used, or None if missing."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, value, size):
+        """Add or replace an entry as the most recently used one."""
+        self._entries[key] = (value, size)
+        self._entries.move_to_end(key)
+
+    def pop_victim(self):
+        """Remove the least recently used entry and return its size."""
+        _, (_, size) = self._entries.popitem(last=False)
+        return size
+
+    def clear(self):
+        self._entries.clear()
+
+    def dump(self):
+        """Return (key, value, size, uses) tuples in eviction order."""
+        return [(key, value, size, 1) for key, (value, size) in self._entries.items()]
+
+    def load(self, entries):
+        for key, value, size, _ in entries:
+            self.put(key, value, size)
+
+
+class LFUStore:
+    """
+    Cache entries grouped by how often they were used.
+
+    Entries live in one ordered bucket per use count, so the least
+    frequently used entry, oldest first among ties, is found without
+    scanning the entries.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._buckets = {}
+        self._min_uses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _touch(self, key, uses):
+        """Move a key from the bucket for uses to the bucket for uses + 1."""
+        bucket = self._buckets[uses]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[uses]
+            if self._min_uses == uses:
+                self._min_uses = uses + 1
+        self._buckets.setdefault(uses + 1, OrderedDict())[key] = None
+
+    def get(self, key):
+        """Return (value, size) and count one more use, or None if missing."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, size, uses = entry
+        self._entries[key] = (value, size, uses + 1)
+        self._touch(key, uses)
+        return value, size
+
+    def put(self, key, value, size, uses=1):
+        """Add an entry, or replace one and count it as a use."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (value, size, entry[2] + 1)
+            self._touch(key, entry[2])
+            return
+        self._entries[key] = (value, size, uses)
+        self._buckets.setdefault(uses, OrderedDict())[key] = None
+        if not self._min_uses or uses < self._min_uses:
+            self._min_uses = uses
+
+    def pop_victim(self):
+        """Remove the least frequently used entry and return its size."""
+        bucket = self._buckets[self._min_uses]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self._buckets[self._min_uses]
+            self._min_uses = min(self._buckets, default=0)
+        _, size, _ = self._entries.pop(key)
+        return size
+
+    def clear(self):
+        self._entries.clear()
+        self._buckets.clear()
+        self._min_uses = 0
+
+    def dump(self):
+        """Return (key, value, size, uses) tuples."""
+        return [(key, value, size, uses) for key, (value, size, uses) in self._entries.items()]
+
+    def load(self, entries):
+        for key, value, size, uses in entries:
+            self.put(key, value, size, uses)
+
+
+class MemoizedFunction:
+    """
+    A function wrapped with a bounded, thread-safe result cache.
+
+    Results are computed outside the lock, so recursive functions can call
+    themselves through the cache and threads never wait on each other's
+    computations; two threads missing on the same key may both compute it.
+    """
+
+    def __init__(self, function, maxsize=128, policy=LRU, max_bytes=None, sizeof=sys.getsizeof,
+                 persist=None, typed=False):
+        self.__wrapped__ = function
+        update_wrapper(self, function)
+        if policy not in (LRU, LFU):
+            raise ValueError(f"policy must be {LRU!r} or {LFU!r}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.persist = persist
+        self.typed = typed
+        self._store = LRUStore() if policy == LRU else LFUStore()
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if persist is not None:
+            self._load()
+            atexit.register(self.save)
+
+    def __call__(self, *args, **kwargs):
+        key = make_key(args, kwargs, self.typed)
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = self.__wrapped__(*args, **kwargs)
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        if self.maxsize == 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return value
+
+        with self._lock:
+            # Another thread may have stored the same result meanwhile
+            if key not in self._store:
+                self._trim(reserve_count=1, reserve_bytes=size)
+                self._store.put(key, value, size)
+                self._bytes += size
+        return value
+
+    def __repr__(self):
+        return f"<memoized {self.__wrapped__!r} ({self.policy}, maxsize={self.maxsize})>"
+
+    def __get__(self, instance, owner=None):
+        # Behave like a plain function when used as a method
+        if instance is None:
+            return self
+        return lambda *args, **kwargs: self(instance, *args, **kwargs)
+
+    def _trim(self, reserve_count=0, reserve_bytes=0):
+        """
+        Evict entries until the cache fits both of its bounds with room to spare.
+
+        Making room before a new entry is added keeps LFU eviction from
+        throwing out the new entry, which always has the fewest uses.
+        """
+        while len(self._store) and (
+            (self.maxsize is not None and len(self._store) + reserve_count > self.maxsize)
+            or (self.max_bytes is not None and self._bytes + reserve_bytes > self.max_bytes)
+        ):
+            self._bytes -= self._store.pop_victim()
+            self.evictions += 1
+
+    def cache_info(self):
+        """
+        Report how well the cache is working.
+
+        Returns:
+            CacheInfo: (hits, misses, evictions, maxsize, currsize, currbytes)
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize,
+                             len(self._store), self._bytes)
+
+    def hit_rate(self):
+        """Return the fraction of calls answered from the cache."""
+        with self._lock:
+            calls = self.hits + self.misses
+            return self.hits / calls if calls else 0.0
+
+    def cache_clear(self):
+        """Forget every cached result and reset the statistics."""
+        with self._lock:
+            self._store.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def save(self):
+        """
+        Write the cache to its persist file, if it has one.
+
+        The file is written to a temporary name first and moved into place,
+        so a crash never leaves half a cache.
+        """
+        if self.persist is None:
+            return
+        with self._lock:
+            entries = self._store.dump()
+        temp_path = f"{self.persist}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, "wb") as cache_file:
+                pickle.dump(entries, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.persist)
+        except (OSError, pickle.PicklingError):
+            # Persistence is a convenience; never fail the program over it
+            pass
+
+    def _load(self):
+        """Read cached results saved by an earlier run, ignoring a damaged file."""
+        try:
+            with open(self.persist, "rb") as cache_file:
+                entries = pickle.load(cache_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+            return
+        with self._lock:
+            self._store.load(entries)
+            self._bytes = sum(size for _, _, size, _ in entries)
+            self._trim()
+
+
+def memoize(maxsize=128, policy=LRU, max_bytes=None, sizeof=sys.getsizeof, persist=None, typed=False):
+    """
+    Decorator that caches a function's results.
+
+    The cached results are only loaded from the persist file if it exists,
+    and it should only ever be a file this module wrote, since it is read
+    with pickle.
+
+    Args:
+        maxsize (int, optional): Most results kept; None for no limit
+        policy (str): "lru" to evict the least recently used result first,
+            "lfu" to evict the least frequently used result first
+        max_bytes (int, optional): Most total size of the cached values
+        sizeof (callable): Measures a value's size for max_bytes
+        persist (str, optional): File the cache is loaded from and saved to
+            at exit
+        typed (bool): Cache arguments of different types separately
+
+    Returns:
+        callable: Decorator producing a MemoizedFunction
+    """
+    def decorator(function):
+        return MemoizedFunction(function, maxsize, policy, max_bytes, sizeof, persist, typed)
+    return decorator
+
+
+def lru_memoize(maxsize=128, **options):
+    """Decorator caching results with least-recently-used eviction."""
+    return memoize(maxsize, LRU, **options)
+
+
+def lfu_memoize(maxsize=128, **options):
+    """Decorator caching results with least-frequently-used eviction."""
+    return memoize(maxsize, LFU, **options)
+
+
+def sized_memoize(max_bytes, policy=LRU, **options):
+    """Decorator caching results up to a total size in bytes, with no count limit."""
+    return memoize(None, policy, max_bytes=max_bytes, **options)
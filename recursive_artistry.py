@@ -9,6 +9,17 @@ import turtle
 import time
 import os
 
+import bigint_output
+import fast_math
+import fractal_cache
+import fractal_geometry
+from memoize import memoize
+
+# Shared on-disk geometry cache, opened on first use
+_geometry_cache = None
+# Memory budget for remembered factorial and Fibonacci results
+RESULT_CACHE_BYTES = 64 * 1024 * 1024
+
 def clear_screen():
     """Clear the console screen based on the operating system."""
     os.system('cls' if os.name == 'nt' else 'clear')
@@ -33,105 +44,43 @@ def get_positive_integer(prompt):
         except ValueError:
             print("Invalid input. Please enter a positive integer.")
 
-def factorial(n):
+@memoize(maxsize=128, max_bytes=RESULT_CACHE_BYTES)
+def factorial(n, modulus=None):
     """
-    Calculate the factorial of n recursively.
+    Calculate the factorial of n.
+    
+    Recursing once per n fails near n = 1000, so this uses the engine from
+    fast_math.py, which has no recursion limit.
     
     Args:
         n (int): A positive integer
+        modulus (int, optional): Return n! % modulus without building n!
         
     Returns:
-        int: The factorial of n (n!)
+        int: The factorial of n (n!), or n! % modulus
     """
-    # Base case
-    if n <= 1:
-        return 1
-    # Recursive case
-    else:
-        return n * factorial(n - 1)
+    if modulus is not None:
+        return fast_math.factorial_mod(n, modulus)
+    return fast_math.factorial(n)
 
-def fibonacci(n):
+@memoize(maxsize=128, max_bytes=RESULT_CACHE_BYTES)
+def fibonacci(n, modulus=None):
     """
-    Calculate the nth number in the Fibonacci sequence recursively.
+    Calculate the nth number in the Fibonacci sequence.
+    
+    The naive double recursion takes exponential time, so this uses the
+    fast-doubling engine from fast_math.py instead.
     
     Args:
         n (int): A positive integer representing the position in the sequence
+        modulus (int, optional): Return F(n) % modulus without building F(n)
         
     Returns:
-        int: The nth Fibonacci number
-    """
-    # Base cases
-    if n <= 0:
-        return 0
-    elif n == 1:
-        return 1
-    # Recursive case
-    else:
-        return fibonacci(n - 1) + fibonacci(n - 2)
-
-def draw_fractal_tree(t, branch_length, level):
-    """
-    Draw a fractal tree recursively.
-    
-    Args:
-        t (turtle.Turtle): The turtle object for drawing
-        branch_length (float): Length of the current branch
-        level (int): Current recursion level
-    """
-    # Base case: stop recursion when level reaches 0
-    if level == 0:
-        return
-    
-    # Draw the current branch
-    t.forward(branch_length)
-    
-    # Save the current position and heading
-    saved_x, saved_y = t.position()
-    saved_heading = t.heading()
-    
-    # Right branch
-    t.right(20)
-    draw_fractal_tree(t, branch_length * 0.75, level - 1)
-    
-    # Restore position and heading
-    t.penup()
-    t.goto(saved_x, saved_y)
-    t.setheading(saved_heading)
-    t.pendown()
-    
-    # Left branch
-    t.left(40)
-    draw_fractal_tree(t, branch_length * 0.75, level - 1)
-    
-    # Return to the original position and heading
-    t.penup()
-    t.goto(saved_x, saved_y)
-    t.setheading(saved_heading)
-    t.pendown()
-
-def draw_fractal_snowflake(t, length, level):
+        int: The nth Fibonacci number, or F(n) % modulus
     """
-    Draw a Koch snowflake fractal recursively.
-    
-    Args:
-        t (turtle.Turtle): The turtle object for drawing
-        length (float): Length of the current segment
-        level (int): Current recursion level
-    """
-    # Base case: draw a straight line
-    if level == 0:
-        t.forward(length)
-        return
-    
-    # Recursive case: replace each segment with 4 segments
-    length /= 3.0
-    draw_fractal_snowflake(t, length, level - 1)
-    t.left(60)
-    draw_fractal_snowflake(t, length, level - 1)
-    t.right(120)
-    draw_fractal_snowflake(t, length, level - 1)
-    t.left(60)
-    draw_fractal_snowflake(t, length, level - 1)
+    if modulus is not None:
+        return fast_math.fibonacci_mod(n, modulus)
+    return fast_math.fibonacci(n)
 
 def setup_turtle():
     """
@@ -154,6 +103,92 @@ def setup_turtle():
     
     return screen, t
 
+def compute_geometry(function, *args, **kwargs):
+    """
+    Compute fractal geometry, reusing the on-disk cache when possible.
+    
+    Args:
+        function (callable): Geometry function from fractal_geometry
+        *args: Positional arguments for the function
+        **kwargs: Keyword arguments for the function
+        
+    Returns:
+        Flat float64 coordinates
+    """
+    global _geometry_cache
+    if _geometry_cache is None:
+        try:
+            _geometry_cache = fractal_cache.GeometryCache()
+        except OSError:
+            # No writable cache directory; just compute every time
+            return function(*args, **kwargs)
+    return _geometry_cache.get(function, *args, **kwargs)
+
+def draw_segments(t, segments):
+    """
+    Draw precomputed line segments with the turtle.
+    
+    Args:
+        t (turtle.Turtle): The turtle object for drawing
+        segments (array): Flat x0, y0, x1, y1 coordinates
+    """
+    for i in range(0, len(segments), 4):
+        t.penup()
+        t.goto(segments[i], segments[i + 1])
+        t.pendown()
+        t.goto(segments[i + 2], segments[i + 3])
+
+def draw_polyline(t, points):
+    """
+    Draw a precomputed polyline with the turtle without lifting the pen.
+    
+    Args:
+        t (turtle.Turtle): The turtle object for drawing
+        points (array): Flat x, y coordinates
+    """
+    t.penup()
+    t.goto(points[0], points[1])
+    t.pendown()
+    for i in range(2, len(points), 2):
+        t.goto(points[i], points[i + 1])
+
+def show_fractal(segments, color, polyline=None):
+    """
+    Save computed fractal geometry to a file or view it with the turtle.
+    
+    Args:
+        segments (array): Flat x0, y0, x1, y1 coordinates
+        color (str): Line colour
+        polyline (array, optional): The same geometry as one connected line,
+            which the turtle draws faster
+    """
+    path = input("Save to a .svg or .png file (leave blank to open a window): ").strip()
+    if path:
+        try:
+            fractal_geometry.save_geometry(path, segments, stroke=color)
+        except (OSError, ValueError) as error:
+            print(f"Could not save the fractal: {error}")
+        else:
+            print(f"Saved {len(segments) // 4:,} segments to {path}.")
+        input("\nPress Enter to continue...")
+        return
+    
+    screen, t = setup_turtle()
+    t.color(color)
+    t.hideturtle()
+    
+    # Draw everything off-screen and show it in one update
+    screen.tracer(0)
+    if polyline is not None:
+        draw_polyline(t, polyline)
+    else:
+        draw_segments(t, segments)
+    screen.update()
+    
+    # Wait for user to close the window
+    print("Close the turtle window to continue.")
+    screen.exitonclick()
+
 def draw_fractal_menu():
     """Display a menu for fractal selection and handle user choice."""
     clear_screen()
@@ -165,50 +200,33 @@ def draw_fractal_menu():
     choice = input("\nEnter your choice (1-3): ")
     
     if choice == '1':
-        # Set up turtle for drawing
-        screen, t = setup_turtle()
-        
-        # Position the turtle for the tree
-        t.penup()
-        t.goto(0, -250)
-        t.setheading(90)  # Point upward
-        t.pendown()
-        
         # Get the recursion level from the user
-        level = get_positive_integer("Enter the recursion level (1-6 recommended): ")
-        level = min(level, 6)  # Limit to avoid excessive recursion
+        level = get_positive_integer("Enter the recursion level (1-12 recommended): ")
         
-        # Draw the fractal tree
+        # Draw the fractal tree, skipping detail too small or too far out to see
         print("\nDrawing a fractal tree... 🌳")
-        draw_fractal_tree(t, 100, level)
-        
-        # Wait for user to close the window
-        print("Close the turtle window to continue.")
-        screen.exitonclick()
+        segments = compute_geometry(
+            fractal_geometry.tree_segments,
+            level,
+            min_length=fractal_geometry.MIN_PIXEL_LENGTH,
+            viewport=fractal_geometry.canvas_viewport(),
+        )
+        show_fractal(segments, "green")
     
     elif choice == '2':
-        # Set up turtle for drawing
-        screen, t = setup_turtle()
-        t.color("blue")
-        
-        # Position the turtle for the snowflake
-        t.penup()
-        t.goto(-200, 0)
-        t.pendown()
-        
         # Get the recursion level from the user
-        level = get_positive_integer("Enter the recursion level (1-4 recommended): ")
-        level = min(level, 4)  # Limit to avoid excessive recursion
+        level = get_positive_integer("Enter the recursion level (1-8 recommended): ")
         
-        # Draw the Koch snowflake (a triangle of Koch curves)
+        # Draw the Koch snowflake (a triangle of Koch curves), skipping
+        # detail too small or too far out to see
         print("\nDrawing a Koch snowflake... ❄️")
-        for _ in range(3):
-            draw_fractal_snowflake(t, 400, level)
-            t.right(120)
-        
-        # Wait for user to close the window
-        print("Close the turtle window to continue.")
-        screen.exitonclick()
+        points = compute_geometry(
+            fractal_geometry.koch_snowflake_points,
+            level,
+            min_length=fractal_geometry.MIN_PIXEL_LENGTH,
+            viewport=fractal_geometry.canvas_viewport(),
+        )
+        show_fractal(fractal_geometry.polyline_segments(points), "blue", polyline=points)
     
     elif choice == '3':
         return
@@ -218,6 +236,23 @@ def draw_fractal_menu():
         time.sleep(1)
         draw_fractal_menu()
 
+def offer_to_save(value):
+    """
+    Offer to save every digit of a result too long to print.
+    
+    Args:
+        value (int): The result that was described on screen
+    """
+    if bigint_output.digit_count(value) <= bigint_output.DISPLAY_DIGITS:
+        return
+    path = input("Save every digit to a file? Enter a path (.txt, .hex or .bin) or leave blank: ").strip()
+    if not path:
+        return
+    try:
+        print(f"Saved {bigint_output.save_number(value, path)} to {path}.")
+    except OSError as error:
+        print(f"Could not save the result: {error}")
+
 def display_menu():
     """Display the main menu and handle user choices."""
     while True:
@@ -234,27 +269,18 @@ def display_menu():
         
         if choice == '1':
             n = get_positive_integer("\nEnter a number to find its factorial: ")
-            if n > 900:
-                print("Warning: Very large factorials may cause overflow or slow computation.")
-                confirm = input("Continue? (y/n): ").lower()
-                if confirm != 'y':
-                    continue
             
             result = factorial(n)
-            print(f"The factorial of {n} is {result}.")
+            print(f"The factorial of {n} is {bigint_output.describe(result)}.")
+            offer_to_save(result)
             input("\nPress Enter to continue...")
         
         elif choice == '2':
             n = get_positive_integer("\nEnter the position of the Fibonacci number: ")
-            if n > 35:
-                print("Warning: Computing high Fibonacci numbers recursively is very slow.")
-                print("This may take a long time due to the nature of recursive calculation.")
-                confirm = input("Continue? (y/n): ").lower()
-                if confirm != 'y':
-                    continue
             
             result = fibonacci(n)
-            print(f"The {n}th Fibonacci number is {result}.")
+            print(f"The {n}th Fibonacci number is {bigint_output.describe(result)}.")
+            offer_to_save(result)
             input("\nPress Enter to continue...")
         
         elif choice == '3':